@@ -0,0 +1,173 @@
+import sys
+import time
+import numpy as np
+from util import read_words
+from infomax import encode_words, split_codes, fast_expectation
+from feedback import encode_feedback
+
+
+def batch_worst_case(guesses, pool, chunk_size=1024):
+    """Computes the worst-case (minimax) cost of every guess in a list, in batched NumPy operations.
+
+    The worst case of a guess is the size of the largest part it splits the pool into
+    (codes are computed by infomax.split_codes), which is the pool an adversary leaves. Ties
+    are broken by the expected pool size, added as a fraction: expectation / (N + 1) < 1.
+
+    Parameters
+    ----------
+    guesses : list[str]
+        A list of candidate guesses
+    pool : list[str]
+        The current pool of possible answers
+    chunk_size : int
+        Number of guesses to score per batch (bounds the memory used)
+
+    Returns
+    -------
+    numpy.ndarray
+        The worst-case cost of each guess
+    """
+
+    num_codes = 3 ** len(pool[0])
+    costs = np.zeros(len(guesses))
+    for start in range(0, len(guesses), chunk_size):
+        codes = split_codes(guesses[start:start + chunk_size], pool)
+        rows = np.arange(codes.shape[0])[:, None] * num_codes
+        sizes = np.bincount((codes + rows).ravel(), minlength=codes.shape[0] * num_codes)
+        sizes = sizes.reshape(codes.shape[0], num_codes)
+        expected = (sizes * sizes).sum(axis=1) / len(pool)
+        costs[start:start + chunk_size] = sizes.max(axis=1) + expected / (len(pool) + 1)
+    return costs
+
+
+def worst_case(guess, pool):
+    """Computes the worst-case cost of a guess (see batch_worst_case).
+
+    Since it exposes batch_worst_case as its batch attribute, a WordleAgent with this
+    cost function scores all of its candidate guesses in one batched call.
+    """
+
+    return float(batch_worst_case([guess], pool)[0])
+
+
+worst_case.batch = batch_worst_case
+worst_case.partition_invariant = True
+worst_case.word_pools = True
+
+
+class Adversary:
+    """An Absurdle-style opponent, who never commits to a target.
+
+    After each guess, the adversary keeps the largest part of the pool (by feedback code),
+    breaking ties in favor of the lowest code. The game is over once the guess is the only
+    word left.
+
+    Parameters
+    ----------
+    duplicate_aware : bool
+        Whether the pool is split by the feedback codes of feedback.feedback_code, as a human
+        player would see them, rather than by split codes (like constraints.update_pool)
+    """
+
+    def __init__(self, duplicate_aware=False):
+        self.duplicate_aware = duplicate_aware
+        self.codes = []
+        self.solved = False
+
+    def reset(self):
+        """Starts a new game."""
+
+        self.codes = []
+        self.solved = False
+
+    def partition_sizes(self, guess, pool):
+        """Returns the feedback code of every pool word, and the size of every part."""
+
+        if self.duplicate_aware:
+            codes = encode_feedback(encode_words([guess]), encode_words(pool))[0]
+        else:
+            codes = split_codes([guess], pool)[0]
+        return codes, np.bincount(codes, minlength=3 ** len(guess))
+
+    def update_pool(self, guess, target, pool):
+        """Answers a guess, like constraints.update_pool does for a fixed target.
+
+        Parameters
+        ----------
+        guess : str
+            The guessed word
+        target : str
+            Ignored, since the adversary has no target (it is accepted so that the method
+            has the signature of constraints.update_pool)
+        pool : list[str]
+            The current pool of possible answers
+
+        Returns
+        -------
+        list[str]
+            The part of the pool that the adversary keeps
+        """
+
+        codes, sizes = self.partition_sizes(guess, pool)
+        code = int(np.argmax(sizes))
+        self.codes.append(code)
+        self.solved = code == 3 ** len(guess) - 1
+        keep = codes == code
+        if hasattr(pool, "subset"):
+            return pool.subset(keep)
+        return [word for word, kept in zip(pool, keep) if kept]
+
+
+def play_adversary(agent, allowed_guesses, pool, adversary=None, first_guess=None,
+                   max_guesses=None):
+    """Plays a game of Absurdle (Wordle against an adversary), without any graphics.
+
+    Parameters
+    ----------
+    agent : agent.WordleAgent
+        AI who will play
+    allowed_guesses : list[str]
+        List of allowable guesses
+    pool : list[str]
+        Pool of possible answers
+    adversary : Adversary, optional
+        The opponent (by default, a new Adversary)
+    first_guess : str, optional
+        The opening guess (by default, agent.first_guess())
+    max_guesses : int, optional
+        If provided, the game is lost after this many guesses
+
+    Returns
+    -------
+    str, list[str]
+        The word the adversary was left with (None if the game was lost), and the agent's
+        guesses in order. Like a (target, guesses) result of simulate.play_one, the
+        guesses can be replayed against that word to reproduce the adversary's feedback.
+    """
+
+    if adversary is None:
+        adversary = Adversary()
+    guess = agent.first_guess() if first_guess is None else first_guess
+    guesses = [guess]
+    while True:
+        pool = adversary.update_pool(guess, None, pool)
+        if adversary.solved:
+            return guess, guesses
+        if max_guesses is not None and len(guesses) == max_guesses:
+            return None, guesses
+        guess = agent.make_guess(allowed_guesses, pool)
+        guesses.append(guess)
+
+
+if __name__ == "__main__":
+    from agent import WordleAgent
+    allowed_file = sys.argv[1]
+    answer_file = sys.argv[2]
+    allowed, answers = read_words(allowed_file), read_words(answer_file)
+    for name, cost_fn in [("expectation", fast_expectation), ("worst case", worst_case)]:
+        start = time.perf_counter()
+        agent = WordleAgent(cost_fn, track_progress=False)
+        opener = agent.make_guess(allowed, answers)
+        answer, guesses = play_adversary(agent, allowed, answers, first_guess=opener)
+        print(f"{name}: solved {answer} in {len(guesses)} guesses ({' '.join(guesses)}), "
+              f"{time.perf_counter() - start:.2f}s")
@@ -1,26 +1,137 @@
 import sys
-from collections import defaultdict
-from numpy import mean
+from time import perf_counter
+from collections import defaultdict, OrderedDict
+import numpy as np
+from numpy import mean, ndarray
 from random import choice, sample, shuffle
-from tqdm import tqdm
 from util import read_words
 from constraints import get_constraints, is_permitted
-from infomax import expectation
+from infomax import fast_expectation, split_codes, partition_labels
+
+
+def score_chunk(cost_fn, guesses, pool):
+    """Scores a list of candidate guesses (in the given order) against a pool of answers.
+
+    Returns
+    -------
+    list[tuple]
+        A list of (cost, guess) pairs
+    """
+
+    batch_fn = getattr(cost_fn, "batch", None)
+    if batch_fn is not None:
+        scores = [float(score) for score in batch_fn(guesses, pool)]
+    else:
+        scores = [cost_fn(word, pool) for word in guesses]
+    return list(zip(scores, guesses))
+
+
+_worker_cost_fn = None
+
+
+def _initialize_worker(cost_fn):
+    # The cost function is shipped to each worker once, when the agent's executor starts.
+    # Pools change every turn, so they travel with each task instead.
+    global _worker_cost_fn
+    _worker_cost_fn = cost_fn
+
+
+def _score_worker_chunk(guesses, pool):
+    return score_chunk(_worker_cost_fn, guesses, pool)
 
 
 class WordleAgent:
 
-    def __init__(self, cost_fn, track_progress=True):
+    def __init__(self, cost_fn, track_progress=True, feedback=None, num_workers=1,
+                 chunk_size=256, cache_size=1024, prune=None, instrument=None, book=None):
         """
         Parameters
         ----------
         cost_fn : function
             A function that takes a candidate guess and an answer pool as input, and outputs a
             "cost" for the candidate guess. Lower costs should correspond to "better" guesses.
+            If the function has a batch attribute (e.g. infomax.fast_expectation), then
+            cost_fn.batch(guesses, pool) is used to score all candidates in a single call.
+        feedback : feedback.FeedbackMatrix, optional
+            A precomputed feedback matrix. If provided, the answer pool is converted once into
+            an array of answer ids before scoring, and cost_fn receives that array as its pool
+            (e.g. use feedback.expectation as the cost_fn). Cost functions that only score
+            pools of words, which they declare with a true word_pools attribute (e.g.
+            infomax.fast_expectation), are rejected with a ValueError.
+        num_workers : int
+            Number of processes used by score_guesses. With a single worker (the default),
+            candidates are scored in the current process. Otherwise, the processes are
+            started on first use and kept until close is called (or the agent is used as a
+            context manager). With a feedback matrix, each task carries the pool as an
+            array of answer ids.
+        chunk_size : int
+            Number of candidate guesses per task when scoring with multiple workers
+        cache_size : int
+            Maximum number of (candidates, pool) states whose guesses make_guess remembers,
+            evicting the least recently used state first. Zero disables the cache.
+        prune : bool, optional
+            Whether make_guess skips guesses that cannot split the pool, and scores only one
+            guess (the alphabetically first) among guesses that split the pool alike. This
+            assumes that guesses which split the pool alike have exactly equal costs, which
+            cost_fn declares with a true partition_invariant attribute (as do
+            feedback.FeedbackMatrix.expectation and the batch scorers, e.g.
+            infomax.fast_expectation). The recursive infomax.expectation, for one, sums
+            floats in an order that depends on the guess's letters, so it may rank such
+            guesses differently. Pruning computes every candidate's codes, which is most of
+            the work of a batch scorer, so it only saves time for cost functions that score
+            one guess at a time (see the prune benchmarks of benchmark.py). By default,
+            pruning is on for those that are partition invariant.
+        instrument : function, optional
+            A callback (e.g. a telemetry.TelemetryRecorder) called as
+            instrument("make_guess", stats) after every guess, where stats records the
+            turn's wall time (in total and for pruning, scoring and sorting), pool size,
+            numbers of candidates offered, pruned and scored, and whether the opening book
+            or the cache hit
+        book : openingbook.OpeningBook, optional
+            A precomputed opening book. If provided, its opener is the first guess, and its
+            replies are looked up before searching for the second guess.
         """
 
+        if feedback is not None and getattr(cost_fn, "word_pools", False):
+            raise ValueError(f"{cost_fn.__name__} scores pools of words, but with a feedback "
+                             f"matrix the pools are arrays of answer ids (use the matrix's "
+                             f"expectation as the cost_fn)")
         self.cost_fn = cost_fn
         self.track_progress = track_progress
+        self.feedback = feedback
+        self.num_workers = num_workers
+        self.chunk_size = chunk_size
+        self.cache_size = cache_size
+        self.guess_cache = OrderedDict()
+        self.candidate_keys = {}
+        self.cache_hits, self.cache_misses, self.cache_evictions = 0, 0, 0
+        if prune is None:
+            prune = getattr(cost_fn, "partition_invariant", False) and not hasattr(cost_fn, "batch")
+        self.prune = prune
+        self.last_pruned, self.total_pruned = 0, 0
+        self.instrument = instrument
+        self.turn = None
+        self.book = book
+        self.executor = None
+
+    def __getstate__(self):
+        # Worker processes cannot be pickled; a copy of the agent starts its own.
+        state = dict(self.__dict__)
+        state["executor"] = None
+        return state
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Shuts down the agent's worker processes, if they were started."""
+
+        if self.executor is not None:
+            self.executor.shutdown(cancel_futures=True)
+            self.executor = None
 
     def score_guesses(self, guesses, pool):
         """Scores each candidate guess, given a pool of possible answers.
@@ -38,29 +149,242 @@ class WordleAgent:
             A list of (cost, guess) pairs, sorted in increasing order
         """
 
-        word_scores = []
-        if self.track_progress:
-            words = tqdm(guesses)
+        if self.turn is not None:
+            start = perf_counter()
+        if self.feedback is not None:
+            pool = self.feedback.answer_ids(pool)
+        if self.num_workers > 1 and len(guesses) > self.chunk_size:
+            word_scores = self.score_guesses_in_parallel(guesses, pool)
+        elif hasattr(self.cost_fn, "batch"):
+            word_scores = score_chunk(self.cost_fn, guesses, pool)
         else:
-            words = guesses
-        for word in words:
-            score = self.cost_fn(word, pool)
-            word_scores.append((score, word))
+            word_scores = []
+            if self.track_progress:
+                from tqdm import tqdm
+                words = tqdm(guesses)
+            else:
+                words = guesses
+            for word in words:
+                score = self.cost_fn(word, pool)
+                word_scores.append((score, word))
+        if self.turn is not None:
+            scored = perf_counter()
+            self.turn["score_seconds"] += scored - start
+            self.turn["scored"] += len(word_scores)
         word_scores = sorted(word_scores)
+        if self.turn is not None:
+            self.turn["sort_seconds"] += perf_counter() - scored
+        return word_scores
+
+    def score_guesses_in_parallel(self, guesses, pool):
+        """Scores the candidate guesses in chunks, across a pool of worker processes.
+
+        Returns
+        -------
+        list[tuple]
+            An (unsorted) list of (cost, guess) pairs
+        """
+
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+        from tqdm import tqdm
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(max_workers=self.num_workers,
+                                                initializer=_initialize_worker,
+                                                initargs=(self.cost_fn,))
+        chunks = [guesses[i:i + self.chunk_size] for i in range(0, len(guesses), self.chunk_size)]
+        futures = [self.executor.submit(_score_worker_chunk, chunk, pool) for chunk in chunks]
+        word_scores = []
+        progress = tqdm(total=len(guesses)) if self.track_progress else None
+        for future in as_completed(futures):
+            chunk_scores = future.result()
+            word_scores.extend(chunk_scores)
+            if progress is not None:
+                progress.update(len(chunk_scores))
+        if progress is not None:
+            progress.close()
         return word_scores
 
     def first_guess(self):
+        if self.book is not None:
+            return self.book.opener
         return "raise"
 
+    def pool_fingerprint(self, allowed_guesses, pool):
+        """Computes a canonical cache key for a set of candidate guesses and a pool.
+
+        The pool is keyed by its sorted contents. Candidate lists are interned as small
+        integers, since there are typically few of them but each is long.
+        """
+
+        candidates = tuple(allowed_guesses)
+        if candidates not in self.candidate_keys:
+            self.candidate_keys[candidates] = len(self.candidate_keys)
+        if isinstance(pool, ndarray):
+            pool = pool.tolist()
+        return self.candidate_keys[candidates], tuple(sorted(pool))
+
+    def cache_info(self):
+        return {"hits": self.cache_hits, "misses": self.cache_misses,
+                "evictions": self.cache_evictions, "size": len(self.guess_cache),
+                "max_size": self.cache_size}
+
+    def clear_cache(self):
+        self.guess_cache.clear()
+        self.candidate_keys.clear()
+        self.cache_hits, self.cache_misses, self.cache_evictions = 0, 0, 0
+
     def make_guess(self, allowed_guesses, pool):
-        if len(pool) == 1:
-            guess = pool[0]
-        elif len(pool) < 4:
-            guess = self.lowest_cost_guess(pool, pool)
-        else:
-            guess = self.lowest_cost_guess(allowed_guesses, pool)
+        if self.instrument is None:
+            return self.book_or_cached_guess(allowed_guesses, pool)
+        self.turn = {"pool_size": len(pool), "candidates": len(allowed_guesses), "pruned": 0,
+                     "scored": 0, "cache_hit": False, "book_hit": False, "prune_seconds": 0.0,
+                     "score_seconds": 0.0, "sort_seconds": 0.0}
+        start = perf_counter()
+        try:
+            guess = self.book_or_cached_guess(allowed_guesses, pool)
+        finally:
+            turn, self.turn = self.turn, None
+        turn["seconds"] = perf_counter() - start
+        self.instrument("make_guess", turn)
         return guess
 
+    def book_or_cached_guess(self, allowed_guesses, pool):
+        if self.book is not None:
+            guess = self.book.reply(pool, None if self.feedback is None else self.feedback.answers)
+            if guess is not None:
+                if self.turn is not None:
+                    self.turn["book_hit"] = True
+                return guess
+        return self.cached_guess(allowed_guesses, pool)
+
+    def cached_guess(self, allowed_guesses, pool):
+        if self.cache_size <= 0:
+            return self.search_guess(allowed_guesses, pool)
+        key = self.pool_fingerprint(allowed_guesses, pool)
+        if key in self.guess_cache:
+            self.cache_hits += 1
+            if self.turn is not None:
+                self.turn["cache_hit"] = True
+            self.guess_cache.move_to_end(key)
+            return self.guess_cache[key]
+        self.cache_misses += 1
+        guess = self.search_guess(allowed_guesses, pool)
+        self.guess_cache[key] = guess
+        if len(self.guess_cache) > self.cache_size:
+            self.guess_cache.popitem(last=False)
+            self.cache_evictions += 1
+        return guess
+
+    def search_guess(self, allowed_guesses, pool):
+        return self.rank_guesses(allowed_guesses, pool)[0][1]
+
+    def rank_guesses(self, allowed_guesses, pool):
+        """Ranks the candidate guesses for a pool, best first (search_guess takes the first).
+
+        A pool of fewer than four answers is guessed from among its own words, and a single
+        answer is guessed outright (with a cost of zero).
+
+        Returns
+        -------
+        list[tuple]
+            A list of (cost, guess) pairs, sorted in increasing order
+        """
+
+        if len(pool) < 4:
+            # An answer-id pool (see feedback.FeedbackMatrix) is guessed from as words
+            words = self.feedback.words(pool) if isinstance(pool, ndarray) else pool
+            if len(pool) == 1:
+                return [(0.0, words[0])]
+            return self.score_guesses(words, pool)
+        if self.prune:
+            start = perf_counter()
+            allowed_guesses = self.prune_candidates(allowed_guesses, pool)
+            if self.turn is not None:
+                self.turn["prune_seconds"] = perf_counter() - start
+                self.turn["pruned"] = self.last_pruned
+        return self.score_guesses(allowed_guesses, pool)
+
+    def candidate_codes(self, guesses, pool):
+        """Computes the feedback code of every candidate guess against every pool word."""
+
+        if self.feedback is None:
+            return split_codes(guesses, pool)
+        return self.feedback.code_matrix(guesses, pool)
+
+    def cost_codes(self, guesses, pool):
+        """Computes the feedback codes that cost_fn partitions the pool by.
+
+        A cost function that is a method of a feedback matrix (e.g.
+        feedback.FeedbackMatrix.expectation) scores that matrix's duplicate-aware codes,
+        even if the agent itself was given no feedback matrix.
+        """
+
+        matrix = getattr(self.cost_fn, "__self__", None)
+        if hasattr(matrix, "code_matrix"):
+            return matrix.code_matrix(guesses, pool)
+        return self.candidate_codes(guesses, pool)
+
+    def prune_candidates(self, guesses, pool):
+        """Removes candidate guesses that cannot change which guess has the lowest cost.
+
+        Guesses that leave the whole pool in a single partition are dropped (unless every
+        guess does), and among guesses that partition the pool alike (by the codes of
+        cost_codes), only the alphabetically first is kept, since it wins any tie in
+        score_guesses. In pools larger than the number of codes, only guesses whose part
+        sizes match another guess's have their partitions compared.
+
+        Parameters
+        ----------
+        guesses : list[str]
+            List of candidate guesses
+        pool : list[str]
+            Pool of possible answers
+
+        Returns
+        -------
+        list[str]
+            The surviving candidates, in their original order
+        """
+
+        if len(guesses) == 0:
+            self.last_pruned = 0
+            return guesses
+        codes = self.cost_codes(guesses, pool)
+        solved_code = 3 ** len(guesses[0]) - 1
+        splits = (codes != codes[:, :1]).any(axis=1)
+        if not splits.any():
+            splits[:] = True
+        candidates = np.flatnonzero(splits)
+        candidates = candidates[np.argsort(np.array(list(guesses))[candidates], kind="stable")]
+        random = np.random.RandomState(0)
+        keep = np.zeros(len(guesses), dtype=bool)
+        shared = candidates
+        if len(pool) > solved_code:
+            # For pools larger than the number of codes, counting part sizes is cheaper than
+            # comparing partitions, and rules out most pairs (the signature hashes the
+            # multiset of part sizes, and the size of the solved part).
+            rows = np.arange(len(candidates))[:, None] * (solved_code + 1)
+            sizes = np.bincount((codes[candidates] + rows).ravel(),
+                                minlength=len(candidates) * (solved_code + 1))
+            sizes = sizes.reshape(len(candidates), solved_code + 1)
+            weights = random.randint(1, 2 ** 62, size=len(pool) + 2, dtype=np.int64)
+            weights[0] = 0
+            signatures = weights[sizes].sum(axis=1) + sizes[:, solved_code] * weights[-1]
+            _, group, counts = np.unique(signatures, return_inverse=True, return_counts=True)
+            keep[candidates[counts[group] == 1]] = True
+            shared = candidates[counts[group] > 1]
+        if len(shared) > 0:
+            labels = partition_labels(codes[shared], solved_code)
+            weights = random.randint(1, 2 ** 62, size=labels.shape[1], dtype=np.int64)
+            _, first, group = np.unique(labels @ weights, return_index=True, return_inverse=True)
+            representatives = first[group]
+            keep[shared] = (representatives == np.arange(len(shared))) | (
+                labels != labels[representatives]).any(axis=1)
+        survivors = [guess for guess, kept in zip(guesses, keep) if kept]
+        self.last_pruned = len(guesses) - len(survivors)
+        self.total_pruned += self.last_pruned
+        return survivors
+
 
     def lowest_cost_guess(self, candidate_guesses, pool):
         """Guesses the candidate with the lowest cost.
@@ -86,7 +410,7 @@ class WordleAgent:
 if __name__ == "__main__":
     allowed_file = sys.argv[1]
     answer_file = sys.argv[2]
-    agent = WordleAgent(expectation)
+    agent = WordleAgent(fast_expectation)
     best_guess = agent.make_guess(read_words(allowed_file), read_words(answer_file))
     print(f"The best first guess in Wordle is {best_guess}.")
 
@@ -0,0 +1,213 @@
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import subprocess
+from pathlib import Path
+from random import Random
+from statistics import mean, median, stdev
+from util import read_words
+from constraints import update_pool
+from infomax import split_pool, expectation, fast_expectation
+from expectimax import max_layer
+from feedback import FeedbackMatrix
+from agent import WordleAgent
+from simulate import play_one
+from openingbook import OpeningBook, save_book
+
+
+SEED = 0
+ALLOWED_FILE = "data/allowed.txt"
+ANSWER_FILE = "data/answers.txt"
+THREE_LETTER_FILE = "data/threeletter.txt"
+
+
+def bench_split_pool():
+    pool = Random(SEED).sample(read_words(ANSWER_FILE), 1000)
+    return lambda: split_pool(pool, "e", 2)
+
+
+def bench_expectation():
+    pool = Random(SEED).sample(read_words(ANSWER_FILE), 500)
+    return lambda: expectation("raise", pool)
+
+
+def bench_update_pool():
+    pool = read_words(ANSWER_FILE)
+    target = Random(SEED).choice(pool)
+    return lambda: update_pool("raise", target, pool)
+
+
+def bench_score_guesses():
+    allowed, pool = read_words(ALLOWED_FILE), read_words(ANSWER_FILE)
+    agent = WordleAgent(fast_expectation, track_progress=False)
+    return lambda: agent.score_guesses(allowed, pool)
+
+
+def bench_max_layer():
+    # An exact search over all of threeletter.txt does not finish, so the answer pool is a
+    # fixed sample (all three-letter words remain allowed guesses).
+    allowed = read_words(THREE_LETTER_FILE)
+    pool = Random(SEED).sample(allowed, 20)
+    return lambda: max_layer(allowed, pool)
+
+
+def bench_game():
+    allowed, pool = read_words(ALLOWED_FILE), read_words(ANSWER_FILE)
+    target = Random(SEED).choice(pool)
+    agent = WordleAgent(fast_expectation, track_progress=False, cache_size=0)
+    return lambda: play_one(agent, allowed, pool, target)
+
+
+def bench_prune(prune=True):
+    # Games scored one guess at a time by FeedbackMatrix.expectation: compare with no_prune
+    # for the time that pruning saves (mostly in the small pools of later turns).
+    allowed, pool = read_words(ALLOWED_FILE), read_words(ANSWER_FILE)
+    matrix = FeedbackMatrix.load(allowed, pool)
+    targets = Random(SEED).sample(pool, 5)
+    agent = WordleAgent(matrix.expectation, track_progress=False, feedback=matrix, cache_size=0,
+                        prune=prune)
+    return lambda: [play_one(agent, allowed, pool, target) for target in targets]
+
+
+def bench_startup():
+    # A cold start of the command line, for a query that the opening book answers. The
+    # book's contents do not matter, since only its opener is looked up. The benchmark
+    # holds on to the book's directory, which is removed once the benchmark is discarded.
+    directory = tempfile.TemporaryDirectory()
+    book_file = os.path.join(directory.name, "book.json")
+    save_book(OpeningBook("raise", {}), book_file)
+    command = [sys.executable, str(Path(__file__).parent / "wordle.py"), "best-guess",
+               ALLOWED_FILE, ANSWER_FILE, "--book", book_file]
+
+    def run(directory=directory):
+        subprocess.run(command, check=True, stdout=subprocess.DEVNULL)
+
+    return run
+
+
+BENCHMARKS = {"split_pool": bench_split_pool,
+              "expectation": bench_expectation,
+              "update_pool": bench_update_pool,
+              "score_guesses": bench_score_guesses,
+              "max_layer": bench_max_layer,
+              "game": bench_game,
+              "prune": bench_prune,
+              "no_prune": lambda: bench_prune(prune=False),
+              "startup": bench_startup}
+
+
+def time_function(fn, rounds=5, min_time=0.2):
+    """Times a function, pytest-benchmark style.
+
+    Each round calls the function enough times to take at least min_time seconds (the
+    number of calls is calibrated on a first, untimed call).
+
+    Returns
+    -------
+    dict
+        Statistics of the seconds taken per call: min, max, mean, median and stddev, with
+        the number of rounds and calls per round
+    """
+
+    start = time.perf_counter()
+    fn()
+    calls = max(1, int(min_time / max(time.perf_counter() - start, 1e-9)))
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(calls):
+            fn()
+        timings.append((time.perf_counter() - start) / calls)
+    return {"min": min(timings), "max": max(timings), "mean": mean(timings),
+            "median": median(timings), "stddev": stdev(timings) if rounds > 1 else 0.0,
+            "rounds": rounds, "calls": calls}
+
+
+def run_benchmarks(names=None, rounds=5):
+    """Runs the named benchmarks (by default, all of them).
+
+    Returns
+    -------
+    dict
+        Machine information, and the timing statistics of each benchmark
+    """
+
+    names = list(BENCHMARKS) if names is None else names
+    results = {"machine": {"python": platform.python_version(), "platform": platform.platform()},
+               "benchmarks": {}}
+    for name in names:
+        results["benchmarks"][name] = time_function(BENCHMARKS[name](), rounds=rounds)
+    return results
+
+
+def compare(results, baseline, threshold=0.1):
+    """Finds the benchmarks whose median time exceeds the baseline's by more than a threshold.
+
+    Parameters
+    ----------
+    results : dict
+        Results of run_benchmarks
+    baseline : dict
+        Earlier results of run_benchmarks
+    threshold : float
+        The tolerated slowdown, as a fraction of the baseline median
+
+    Returns
+    -------
+    list[tuple]
+        A (name, baseline median, current median, ratio) tuple for each slower benchmark
+    """
+
+    slowdowns = []
+    for name, stats in results["benchmarks"].items():
+        if name in baseline["benchmarks"]:
+            before = baseline["benchmarks"][name]["median"]
+            ratio = stats["median"] / before
+            if ratio > 1 + threshold:
+                slowdowns.append((name, before, stats["median"], ratio))
+    return slowdowns
+
+
+def print_results(results, baseline=None):
+    print(f"{'benchmark':<16}{'median (ms)':>14}{'min (ms)':>12}{'stddev (ms)':>14}{'vs baseline':>14}")
+    for name, stats in results["benchmarks"].items():
+        change = ""
+        if baseline is not None and name in baseline["benchmarks"]:
+            change = f"{stats['median'] / baseline['benchmarks'][name]['median']:.2f}x"
+        print(f"{name:<16}{1000 * stats['median']:>14.3f}{1000 * stats['min']:>12.3f}"
+              f"{1000 * stats['stddev']:>14.3f}{change:>14}")
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description="Times the hot paths of the Wordle agent.")
+    parser.add_argument("--only", nargs="+", choices=list(BENCHMARKS), help="benchmarks to run")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--json", help="file where the results are saved")
+    parser.add_argument("--compare", help="baseline results to compare against")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="tolerated slowdown relative to the baseline (default 10%%)")
+    args = parser.parse_args(args)
+    results = run_benchmarks(args.only, rounds=args.rounds)
+    baseline = None
+    if args.compare is not None:
+        with open(args.compare) as reader:
+            baseline = json.load(reader)
+    print_results(results, baseline)
+    if args.json is not None:
+        with open(args.json, "w") as writer:
+            json.dump(results, writer, indent=2)
+    if baseline is not None:
+        slowdowns = compare(results, baseline, args.threshold)
+        for name, before, after, ratio in slowdowns:
+            print(f"SLOWDOWN: {name} took {1000 * after:.3f} ms vs {1000 * before:.3f} ms "
+                  f"({ratio:.2f}x)")
+        return 1 if len(slowdowns) > 0 else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
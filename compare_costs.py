@@ -0,0 +1,80 @@
+import time
+import json
+import argparse
+from util import Vocabulary
+from agent import WordleAgent
+from infomax import fast_expectation
+from naive import pool_reduction
+from entropy import entropy
+from adversary import worst_case
+from simulate import simulate, summarize
+
+
+COSTS = {"expectation": fast_expectation,
+         "reduction": pool_reduction,
+         "entropy": entropy,
+         "worst_case": worst_case}
+
+
+def compare(allowed_guesses, pool, cost_names, targets=None, num_workers=1):
+    """Plays every target with an agent for each cost function, and measures the results.
+
+    Parameters
+    ----------
+    allowed_guesses : list[str]
+        List of allowable guesses
+    pool : list[str]
+        Pool of possible answers
+    cost_names : list[str]
+        Names of the cost functions to compare (keys of COSTS)
+    targets : list[str], optional
+        The target words to play (the default is every word in the pool)
+    num_workers : int
+        Number of processes that play games
+
+    Returns
+    -------
+    list[dict]
+        For each cost function: the number of games, mean number of guesses, number of
+        failures and wall-clock seconds taken
+    """
+
+    rows = []
+    for name in cost_names:
+        agent = WordleAgent(COSTS[name], track_progress=False)
+        start = time.perf_counter()
+        results = simulate(agent, allowed_guesses, pool, targets=targets,
+                           num_workers=num_workers, track_progress=False)
+        seconds = time.perf_counter() - start
+        summary = summarize(results)
+        rows.append({"cost": name, "games": summary["games"],
+                     "mean_guesses": summary["mean_guesses"],
+                     "failures": summary["failures"], "seconds": seconds})
+    return rows
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description="Compares the agent's cost functions.")
+    parser.add_argument("allowed_file")
+    parser.add_argument("answer_file")
+    parser.add_argument("--costs", nargs="+", choices=sorted(COSTS), default=list(COSTS),
+                        help="cost functions to compare")
+    parser.add_argument("--limit", type=int, help="only play the first LIMIT answers")
+    parser.add_argument("--workers", type=int, default=1, help="number of processes")
+    parser.add_argument("--json", help="file for the comparison, as JSON")
+    args = parser.parse_args(args)
+    pool = Vocabulary.from_file(args.answer_file)
+    targets = list(pool)[:args.limit] if args.limit is not None else None
+    rows = compare(Vocabulary.from_file(args.allowed_file), pool, args.costs,
+                   targets=targets, num_workers=args.workers)
+    if args.json is not None:
+        with open(args.json, "w") as writer:
+            json.dump(rows, writer, indent=2)
+    print(f"{'cost':<12}{'games':>8}{'mean':>10}{'failures':>10}{'seconds':>10}")
+    for row in rows:
+        print(f"{row['cost']:<12}{row['games']:>8}{row['mean_guesses']:>10.4f}"
+              f"{row['failures']:>10}{row['seconds']:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,10 @@
 import sys
+from time import perf_counter
 from abc import ABC, abstractmethod
+import numpy as np
 from numpy import mean
 from random import sample
-from util import read_words
+from util import read_words, Vocabulary, PoolView
 
 
 class Constraint(ABC):
@@ -135,7 +137,7 @@ def get_constraints(guess, target):
 
 
 def get_constraint_colors(guess, target):
-    result = ["gray"] * 5
+    result = ["gray"] * len(guess)
     for pos, letter in enumerate(guess):
         if target[pos] == letter:
             result[pos] = "green"
@@ -147,7 +149,143 @@ def get_constraint_colors(guess, target):
     return result
 
 
-def update_pool(guess, target, pool):
+def letter_bit(letter):
+    """Returns the bit representing a letter in a 26-bit letter mask."""
+
+    return 1 << (ord(letter.lower()) - ord('a'))
+
+
+ALL_LETTERS = (1 << 26) - 1
+
+
+def compile_constraints(constraints, length):
+    """Compiles a set of constraints into letter masks.
+
+    A word satisfies all of the constraints iff every letter of the word is allowed at its
+    position, and every required letter appears somewhere in the word.
+
+    Parameters
+    ----------
+    constraints : iterable[Constraint]
+        The set of constraints to compile
+    length : int
+        The length of the words being constrained
+
+    Returns
+    -------
+    int, list[int]
+        The 26-bit mask of required letters, and the 26-bit mask of allowed letters
+        at each position
+    """
+
+    required = 0
+    allowed = [ALL_LETTERS] * length
+    for constraint in constraints:
+        bit = letter_bit(constraint.letter)
+        if isinstance(constraint, EqualityConstraint):
+            allowed[constraint.position] &= bit
+        else:
+            if len(constraint.positions) > 0:
+                required |= bit
+            for pos in range(length):
+                if pos not in constraint.positions:
+                    allowed[pos] &= ~bit
+    return required, allowed
+
+
+class WordIndex:
+    """A compact, mask-based index of a word list, for vectorized pool filtering.
+
+    Each word is stored as a 26-bit letter mask per position plus a 26-bit mask of the
+    letters it contains. Pools are arrays of word ids (positions in the word list) or
+    boolean bitsets over the word list, rather than lists of strings.
+
+    Parameters
+    ----------
+    words : list[str]
+        The indexed words (all of the same length)
+    """
+
+    def __init__(self, words):
+        self.words = list(words)
+        self.word_ids = {word: i for i, word in enumerate(self.words)}
+        self.length = len(self.words[0]) if len(self.words) > 0 else 0
+        self.position_masks = np.array([[letter_bit(letter) for letter in word]
+                                        for word in self.words],
+                                       dtype=np.uint32).reshape(len(self.words), self.length)
+        self.presence = np.bitwise_or.reduce(self.position_masks, axis=1)
+
+    def ids(self, pool):
+        """Converts a pool (list of words, bitset or id array) into an array of word ids."""
+
+        if isinstance(pool, np.ndarray):
+            return np.flatnonzero(pool) if pool.dtype == bool else pool
+        return np.array([self.word_ids[word] for word in pool], dtype=np.intp)
+
+    def bitset(self, pool):
+        """Converts a pool into a boolean bitset over the indexed words."""
+
+        if isinstance(pool, np.ndarray) and pool.dtype == bool:
+            return pool
+        result = np.zeros(len(self.words), dtype=bool)
+        result[self.ids(pool)] = True
+        return result
+
+    def to_words(self, pool):
+        """Converts a pool into a list of words."""
+
+        return [self.words[i] for i in self.ids(pool)]
+
+    def permitted(self, constraints, pool=None):
+        """Determines which words of a pool are consistent with a set of constraints.
+
+        Parameters
+        ----------
+        constraints : iterable[Constraint]
+            the set of constraints to consider
+        pool : numpy.ndarray, optional
+            An array of word ids (the default is every indexed word)
+
+        Returns
+        -------
+        numpy.ndarray
+            A boolean array, aligned with the pool, that is True for the permitted words
+        """
+
+        if pool is None:
+            pool = np.arange(len(self.words))
+        required, allowed = compile_constraints(constraints, self.length)
+        masks = self.position_masks[pool]
+        keep = (self.presence[pool] & required) == required
+        for pos in range(self.length):
+            keep &= (masks[:, pos] & allowed[pos]) != 0
+        return keep
+
+    def update_pool(self, guess, target, pool):
+        """Filters a pool like update_pool, preserving the pool's representation."""
+
+        constraints = get_constraints(guess, target)
+        if isinstance(pool, np.ndarray) and pool.dtype == bool:
+            result = np.zeros(len(self.words), dtype=bool)
+            ids = np.flatnonzero(pool)
+            result[ids[self.permitted(constraints, ids)]] = True
+            return result
+        ids = self.ids(pool)
+        permitted = ids[self.permitted(constraints, ids)]
+        if isinstance(pool, np.ndarray):
+            return permitted
+        return [self.words[i] for i in permitted]
+
+
+def pool_size(pool):
+    """Counts the words of a pool (which may be a boolean bitset over a WordIndex)."""
+
+    if isinstance(pool, np.ndarray) and pool.dtype == bool:
+        return int(np.count_nonzero(pool))
+    return len(pool)
+
+
+def update_pool(guess, target, pool, feedback=None, index=None, instrument=None):
     """Updates the pool of possible answers after a guess.
 
     Parameters
@@ -157,7 +295,20 @@ def update_pool(guess, target, pool):
     target : str
         The hidden target word
     pool : list[str]
-        Original pool of possible answers.
+        Original pool of possible answers. If the pool is a util.Vocabulary or a
+        util.PoolView, the result is a PoolView of the same vocabulary.
+    feedback : feedback.FeedbackMatrix, optional
+        If provided, the pool is filtered by looking up feedback codes in the precomputed
+        matrix (keeping exactly the words that would produce the same colors as the target),
+        rather than by checking constraints word by word.
+    index : WordIndex, optional
+        If provided, the constraints are compiled into letter masks and the pool is
+        filtered with vectorized mask tests. The pool may then also be an array of word
+        ids or a boolean bitset over the index, and the result has the same form.
+    instrument : function, optional
+        A callback (e.g. a telemetry.TelemetryRecorder) called as
+        instrument("update_pool", stats), where stats records the wall time and the
+        pool sizes before and after the update
 
     Returns
     -------
@@ -165,6 +316,21 @@ def update_pool(guess, target, pool):
         The subset of the original pool that remain possible after making the guess.
     """
 
+    if instrument is not None:
+        start = perf_counter()
+        permitted = update_pool(guess, target, pool, feedback=feedback, index=index)
+        instrument("update_pool", {"seconds": perf_counter() - start,
+                                   "pool_before": pool_size(pool),
+                                   "pool_after": pool_size(permitted)})
+        return permitted
+    if feedback is not None:
+        return feedback.update_pool(guess, target, pool)
+    if index is not None:
+        return index.update_pool(guess, target, pool)
     constraints = get_constraints(guess, target)
+    if isinstance(pool, Vocabulary):
+        pool = pool.pool()
+    if isinstance(pool, PoolView):
+        return pool.subset([is_permitted(word, constraints) for word in pool])
     permitted = [word for word in pool if is_permitted(word, constraints)]
     return permitted
\ No newline at end of file
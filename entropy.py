@@ -0,0 +1,62 @@
+import sys
+import numpy as np
+from util import read_words
+from infomax import split_codes
+
+
+def batch_entropy(guesses, pool, chunk_size=1024):
+    """Computes the (negated) information gain of every guess in a list, in batched NumPy operations.
+
+    The information gain of a guess is the Shannon entropy, in bits, of the feedback it
+    produces over the pool: log2(N) - sum(n_k * log2(n_k)) / N, where n_k is the number of
+    pool words that produce feedback code k (codes are computed by infomax.split_codes).
+
+    Parameters
+    ----------
+    guesses : list[str]
+        A list of candidate guesses
+    pool : list[str]
+        The current pool of possible answers
+    chunk_size : int
+        Number of guesses to score per batch (bounds the memory used)
+
+    Returns
+    -------
+    numpy.ndarray
+        The negated entropy of each guess (so that lower costs are better)
+    """
+
+    num_codes = 3 ** len(pool[0])
+    costs = np.zeros(len(guesses))
+    for start in range(0, len(guesses), chunk_size):
+        codes = split_codes(guesses[start:start + chunk_size], pool)
+        rows = np.arange(codes.shape[0])[:, None] * num_codes
+        sizes = np.bincount((codes + rows).ravel(), minlength=codes.shape[0] * num_codes)
+        # Sorting the part sizes makes the float sum independent of which codes they have
+        sizes = np.sort(sizes.reshape(codes.shape[0], num_codes), axis=1)
+        weighted = (sizes * np.log2(np.maximum(sizes, 1))).sum(axis=1)
+        costs[start:start + chunk_size] = weighted / len(pool) - np.log2(len(pool))
+    return costs
+
+
+def entropy(guess, pool):
+    """Computes the negated information gain of a guess (see batch_entropy).
+
+    Since it exposes batch_entropy as its batch attribute, a WordleAgent with this
+    cost function scores all of its candidate guesses in one batched call.
+    """
+
+    return float(batch_entropy([guess], pool)[0])
+
+
+entropy.batch = batch_entropy
+entropy.partition_invariant = True
+entropy.word_pools = True
+
+
+if __name__ == "__main__":
+    allowed = read_words(sys.argv[1])
+    pool = read_words(sys.argv[2])
+    costs = batch_entropy(allowed, pool)
+    best = int(np.argmin(costs))
+    print(f"The most informative first guess is {allowed[best]} ({-costs[best]:.4f} bits).")
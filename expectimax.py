@@ -1,44 +1,209 @@
 import sys
 from collections import defaultdict
+import numpy as np
 from numpy import mean
 from random import choice, sample, shuffle
-from tqdm import tqdm
 from util import read_words
 from constraints import get_constraints, is_permitted
-from infomax import split_pool
+from infomax import split_codes, partition_labels
+from feedback import code_dtype
 
 
-def max_layer(allowed_guesses, answer_pool):
-    best_guess, best_value = None, float('inf')
-    for guess in allowed_guesses:
-        revised_guesses = [g for g in allowed_guesses if g != guess]
-        if guess in answer_pool:
-            revised_pool = [answer for answer in answer_pool if answer != guess]
-            value = ((1 + (1 + expectation_layer(guess, revised_pool, revised_guesses)) * len(revised_pool)) /
-                     (1 + len(revised_pool)))
+class ExpectimaxSolver:
+    """Finds the guess that minimizes the expected number of guesses needed to win.
+
+    The search is an expectimax over feedback partitions, with
+    - a transposition table of solved pools (and of lower bounds for pools whose search
+      was cut off),
+    - alpha-beta style cutoffs: a guess is abandoned as soon as a lower bound on its value
+      reaches the best value found so far,
+    - candidate guesses ordered by the infomax expected pool size, and
+    - pools partitioned by precomputed feedback codes rather than by split_pool.
+
+    Every pool of size m needs at least 2 - 1/m guesses on average (guess one of its words,
+    then each of the others), which gives the lower bounds used for the cutoffs. Guesses
+    that do not split the pool are never worth making, so they are skipped.
+
+    Parameters
+    ----------
+    allowed_guesses : list[str]
+        List of allowable guesses
+    answers : list[str]
+        List of possible answers
+    feedback : feedback.FeedbackMatrix, optional
+        If provided, pools are partitioned by its duplicate-aware feedback codes. Otherwise,
+        they are partitioned like split_pool.
+    max_candidates : int, optional
+        If provided, only the best max_candidates guesses (according to the infomax
+        heuristic) are searched at each node, trading optimality for speed
+    max_guesses : int, optional
+        If provided, pools that cannot be solved within this many guesses have infinite value
+    """
+
+    def __init__(self, allowed_guesses, answers, feedback=None, max_candidates=None,
+                 max_guesses=None):
+        self.guesses = list(allowed_guesses)
+        self.answers = list(answers)
+        length = len(self.answers[0])
+        if feedback is not None:
+            rows = [feedback.guess_index[guess] for guess in self.guesses]
+            columns = feedback.answer_ids(self.answers)
+            self.codes = np.asarray(feedback.codes[np.ix_(rows, columns)])
+        else:
+            self.codes = np.zeros((len(self.guesses), len(self.answers)), dtype=code_dtype(length))
+            for start in range(0, len(self.guesses), 1024):
+                self.codes[start:start + 1024] = split_codes(self.guesses[start:start + 1024],
+                                                             self.answers)
+        self.num_codes = 3 ** length
+        self.solved_code = self.num_codes - 1
+        self.max_candidates = max_candidates
+        self.max_guesses = max_guesses
+        self.table = {}
+        self.lower_bounds = {}
+        self.nodes, self.table_hits = 0, 0
+
+    def solve(self, pool=None):
+        """Finds the best guess for a pool of answers (by default, all of them).
+
+        Returns
+        -------
+        str, float
+            The best guess, and the expected number of guesses needed to win
+        """
+
+        if pool is None:
+            ids = np.arange(len(self.answers))
         else:
-            value = 1 + expectation_layer(guess, answer_pool, revised_guesses)
-        if value < best_value:
-            best_guess, best_value = guess, value
-    return best_guess, best_value
-
-
-def expectation_layer(guess, pool, allowed_guesses, position=0):
-    partitions = split_pool(pool, guess[position], position)
-    result = 0
-    for partition in partitions:
-        if len(partition) > 0:
-            factor = len(partition) / len(pool)
-            if position + 1 >= len(guess):
-                _, expected_size = max_layer(allowed_guesses, partition)
-            else:
-                expected_size = expectation_layer(guess, partition, allowed_guesses, position + 1)
-            result += factor * expected_size
-    return result
+            answer_index = {word: i for i, word in enumerate(self.answers)}
+            ids = np.array(sorted(answer_index[word] for word in pool), dtype=np.intp)
+        return self.search(ids, float('inf'), self.max_guesses)
+
+    def search(self, pool, beta, guesses_left):
+        """Searches for the best guess for a pool, given as a sorted array of answer ids.
+
+        Returns
+        -------
+        str, float
+            The best guess and its value if the value is below beta. Otherwise, None and
+            a lower bound on the value (that is at least beta).
+        """
+
+        n = len(pool)
+        if guesses_left is not None and guesses_left <= 0:
+            return None, float('inf')
+        if n == 1:
+            return self.answers[pool[0]], 1.0
+        if guesses_left == 1:
+            return None, float('inf')
+        key = (guesses_left, pool.tobytes())
+        if key in self.table:
+            self.table_hits += 1
+            return self.table[key]
+        if self.lower_bounds.get(key, 0.0) >= beta:
+            self.table_hits += 1
+            return None, self.lower_bounds[key]
+        self.nodes += 1
+        rows = self.codes[:, pool]
+        offsets = np.arange(len(self.guesses))[:, None] * self.num_codes
+        sizes = np.bincount((rows + offsets).ravel(), minlength=len(self.guesses) * self.num_codes)
+        sizes = sizes.reshape(len(self.guesses), self.num_codes)
+        solved = sizes[:, self.solved_code]
+        parts = np.count_nonzero(sizes, axis=1) - solved
+        lower = 1 + (2 * (n - solved) - parts) / n
+        heuristic = (sizes * sizes).sum(axis=1) / n
+        order = np.lexsort((np.arange(len(self.guesses)), -solved, heuristic))
+        order = order[((solved > 0) | (parts > 1))[order]]
+        if len(order) == 0:
+            # No guess solves a word or splits the pool, so the pool can never be solved
+            self.lower_bounds[key] = float('inf')
+            return None, float('inf')
+        if self.max_candidates is not None:
+            order = order[:self.max_candidates]
+        labels = partition_labels(rows[order], self.solved_code)
+        lowest = float(lower[order].min())
+        self.lower_bounds[key] = max(self.lower_bounds.get(key, 0.0), lowest)
+        best_guess, best_value = None, float('inf')
+        seen = set()
+        for guess, guess_labels in zip(order, labels):
+            bound = min(best_value, beta)
+            if bound <= lowest:
+                break
+            signature = guess_labels.tobytes()
+            if lower[guess] >= bound or signature in seen:
+                continue
+            seen.add(signature)
+            value = self.evaluate(rows[guess], pool, bound, guesses_left)
+            if value < bound:
+                best_guess, best_value = self.guesses[guess], value
+        if best_value < beta:
+            self.table[key] = (best_guess, best_value)
+            return best_guess, best_value
+        self.lower_bounds[key] = max(self.lower_bounds.get(key, 0.0), beta)
+        return None, beta
+
+    def lower_bound(self, pool, guesses_left):
+        """Returns a lower bound on the value of a pool, tightened by any earlier search."""
+
+        n = len(pool)
+        if n == 1:
+            return 1.0
+        return max(2 - 1 / n, self.lower_bounds.get((guesses_left, pool.tobytes()), 0.0))
+
+    def evaluate(self, codes, pool, bound, guesses_left):
+        """Computes the value of a guess, given its feedback codes against the pool.
+
+        Returns
+        -------
+        float
+            The value of the guess if it is below bound, otherwise a lower bound on the
+            value (that is at least bound)
+        """
+
+        n = len(pool)
+        next_left = None if guesses_left is None else guesses_left - 1
+        order = np.argsort(codes, kind='stable')
+        sorted_codes = codes[order]
+        parts = np.split(pool[order], np.flatnonzero(np.diff(sorted_codes)) + 1)
+        parts = [part for part, code in zip(parts, np.unique(sorted_codes))
+                 if code != self.solved_code]
+        parts.sort(key=len, reverse=True)
+        bounds = [len(part) * self.lower_bound(part, next_left) for part in parts]
+        remaining = sum(bounds)
+        total = 0.0
+        for part, part_bound in zip(parts, bounds):
+            remaining -= part_bound
+            child_beta = ((bound - 1) * n - total - remaining) / len(part)
+            _, value = self.search(part, child_beta, next_left)
+            total += len(part) * value
+            if 1 + (total + remaining) / n >= bound:
+                return float(1 + (total + remaining) / n)
+        return float(1 + total / n)
+
+
+def max_layer(allowed_guesses, answer_pool):
+    """Finds the guess that minimizes the expected number of guesses needed to win.
+
+    Parameters
+    ----------
+    allowed_guesses : list[str]
+        List of allowable guesses
+    answer_pool : list[str]
+        Pool of possible answers
+
+    Returns
+    -------
+    str, float
+        The best guess, and the expected number of guesses needed to win
+    """
+
+    return ExpectimaxSolver(allowed_guesses, answer_pool).solve()
 
 
 if __name__ == "__main__":
     allowed_file = sys.argv[1]
     answer_file = sys.argv[2]
-    print(max_layer(read_words(allowed_file), read_words(answer_file)))
-
+    max_candidates = int(sys.argv[3]) if len(sys.argv) > 3 else None
+    solver = ExpectimaxSolver(read_words(allowed_file), read_words(answer_file),
+                              max_candidates=max_candidates)
+    print(solver.solve())
+    print(f"Searched {solver.nodes} nodes ({solver.table_hits} transposition table hits).")
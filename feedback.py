@@ -0,0 +1,263 @@
+import sys
+import os
+import hashlib
+import numpy as np
+from util import read_words
+from constraints import get_constraint_colors
+from infomax import encode_words
+
+
+COLOR_CODES = {"gray": 0, "yellow": 1, "green": 2}
+COLORS = ["gray", "yellow", "green"]
+CACHE_DIR = "cache"
+CACHE_VERSION = 1
+
+
+def feedback_code(guess, target):
+    """Encodes the Wordle feedback for a guess as a single base-3 integer.
+
+    Position i of the guess contributes (0 for gray, 1 for yellow, 2 for green) * 3**i,
+    using the duplicate-aware coloring of constraints.get_constraint_colors.
+
+    Parameters
+    ----------
+    guess : str
+        The guessed word
+    target : str
+        The game's secret target word
+
+    Returns
+    -------
+    int
+        The feedback code, between 0 and 3**len(guess) - 1
+    """
+
+    colors = get_constraint_colors(guess, target)
+    code = 0
+    for pos, color in enumerate(colors):
+        code += COLOR_CODES[color] * 3 ** pos
+    return code
+
+
+def code_dtype(length):
+    """Returns the smallest unsigned integer dtype that holds every feedback code of a length."""
+
+    return np.min_scalar_type(3 ** length - 1)
+
+
+def encode_feedback(guess_letters, answer_letters):
+    """Computes feedback_code for every (guess, answer) pair of two blocks of words, at once.
+
+    A guess letter is green if the answer has the same letter at that position. Otherwise,
+    it is yellow iff the number of non-green occurrences of the letter in the guess, up to
+    and including this position, is at most the number of occurrences of the letter in the
+    answer that are not matched by a green. This reproduces get_constraint_colors exactly,
+    including for duplicate letters.
+
+    Parameters
+    ----------
+    guess_letters : numpy.ndarray
+        An array of letter codes of shape (num_guesses, length), e.g. from infomax.encode_words
+    answer_letters : numpy.ndarray
+        An array of letter codes of shape (num_answers, length)
+
+    Returns
+    -------
+    numpy.ndarray
+        An array of feedback codes, of shape (num_guesses, num_answers), whose dtype is
+        code_dtype(length): uint8 for words of up to 5 letters
+    """
+
+    length = guess_letters.shape[1]
+    green = (guess_letters[:, None, :] == answer_letters[None, :, :]).astype(np.float32)
+    answer_counts = np.zeros((len(answer_letters), 256), dtype=np.float32)
+    for position in range(length):
+        np.add.at(answer_counts, (np.arange(len(answer_letters)), answer_letters[:, position]), 1)
+    same = (guess_letters[:, :, None] == guess_letters[:, None, :]).astype(np.float32)
+    earlier = same * np.tri(length, dtype=np.float32)
+    # Occurrences of each guess letter in the answer, less those already matched by greens.
+    available = answer_counts[:, guess_letters].transpose(1, 0, 2) - green @ same
+    # Non-green occurrences of each guess letter, up to and including its position.
+    rank = (1 - green) @ earlier.transpose(0, 2, 1)
+    yellow = (green == 0) & (rank <= available)
+    green = green == 1
+    dtype = code_dtype(length)
+    weights = (3 ** np.arange(length)).astype(dtype)
+    return ((2 * green + yellow).astype(dtype) * weights).sum(axis=2, dtype=dtype)
+
+
+def decode_feedback(code, length=5):
+    """Converts a base-3 feedback code back into a list of colors."""
+
+    colors = []
+    for _ in range(length):
+        colors.append(COLORS[code % 3])
+        code //= 3
+    return colors
+
+
+def cache_key(guesses, answers):
+    """Computes a content hash identifying the feedback matrix for two word lists."""
+
+    digest = hashlib.sha256(f"v{CACHE_VERSION}\n".encode())
+    digest.update("\n".join(guesses).encode())
+    digest.update(b"\0")
+    digest.update("\n".join(answers).encode())
+    return digest.hexdigest()[:16]
+
+
+class FeedbackMatrix:
+    """Precomputed feedback codes for every (guess, answer) pair.
+
+    Row g, column a of the matrix holds feedback_code(guesses[g], answers[a]). Pools of
+    possible answers can be given either as lists of words or as arrays of answer ids
+    (column indices), and filtering preserves whichever representation it was given.
+
+    Parameters
+    ----------
+    guesses : list[str]
+        List of allowable guesses (the matrix rows)
+    answers : list[str]
+        List of possible answers (the matrix columns)
+    codes : numpy.ndarray, optional
+        A precomputed code matrix of shape (len(guesses), len(answers))
+    """
+
+    def __init__(self, guesses, answers, codes=None):
+        self.guesses = list(guesses)
+        self.answers = list(answers)
+        self.guess_index = {word: i for i, word in enumerate(self.guesses)}
+        self.answer_index = {word: i for i, word in enumerate(self.answers)}
+        if codes is None:
+            codes = FeedbackMatrix.build_codes(self.guesses, self.answers)
+        self.codes = codes
+        self.cache_file = None
+
+    def __getstate__(self):
+        # A cached matrix is sent to other processes by filename, and re-mapped on arrival.
+        state = dict(self.__dict__)
+        if self.cache_file is not None:
+            state["codes"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if self.codes is None:
+            self.codes = np.load(self.cache_file, mmap_mode="r")
+
+    @staticmethod
+    def build_codes(guesses, answers, chunk_size=128):
+        guess_letters = encode_words(guesses)
+        answer_letters = encode_words(answers)
+        codes = np.zeros((len(guesses), len(answers)), dtype=code_dtype(answer_letters.shape[1]))
+        for start in range(0, len(guesses), chunk_size):
+            codes[start:start + chunk_size] = encode_feedback(
+                guess_letters[start:start + chunk_size], answer_letters)
+        return codes
+
+    @classmethod
+    def load(cls, guesses, answers, cache_dir=CACHE_DIR):
+        """Loads the feedback matrix for a pair of word lists from the on-disk cache.
+
+        The cache file is named by a hash of the word lists, so it is rebuilt whenever
+        their contents change. The codes are memory-mapped read-only, so that every
+        process that loads the same matrix shares a single copy in the page cache.
+
+        Parameters
+        ----------
+        guesses : list[str]
+            List of allowable guesses (the matrix rows)
+        answers : list[str]
+            List of possible answers (the matrix columns)
+        cache_dir : str
+            Directory where cached matrices are stored
+
+        Returns
+        -------
+        FeedbackMatrix
+            The (possibly freshly built) feedback matrix
+        """
+
+        filename = os.path.join(cache_dir, f"feedback.{cache_key(guesses, answers)}.npy")
+        if not os.path.exists(filename):
+            os.makedirs(cache_dir, exist_ok=True)
+            codes = cls.build_codes(guesses, answers)
+            partial = f"{filename}.{os.getpid()}.tmp"
+            with open(partial, "wb") as writer:
+                np.save(writer, codes)
+            os.replace(partial, filename)
+        matrix = cls(guesses, answers, codes=np.load(filename, mmap_mode="r"))
+        matrix.cache_file = filename
+        return matrix
+
+    @classmethod
+    def from_files(cls, guess_file, answer_file, cache_dir=CACHE_DIR):
+        """Loads the (cached) feedback matrix for a pair of word files."""
+
+        return cls.load(read_words(guess_file), read_words(answer_file), cache_dir=cache_dir)
+
+    def answer_ids(self, pool):
+        """Converts a pool of answers into an array of answer ids (a no-op for id arrays)."""
+
+        if isinstance(pool, np.ndarray):
+            return pool
+        return np.array([self.answer_index[word] for word in pool], dtype=np.intp)
+
+    def words(self, ids):
+        """Converts an array of answer ids back into a list of words."""
+
+        return [self.answers[i] for i in ids]
+
+    def patterns(self, guess, pool):
+        """Returns the feedback codes of a guess against every answer in a pool.
+
+        Guesses that are not rows of the matrix are encoded on the fly.
+        """
+
+        ids = self.answer_ids(pool)
+        if guess in self.guess_index:
+            return self.codes[self.guess_index[guess], ids]
+        return np.array([feedback_code(guess, self.answers[i]) for i in ids],
+                        dtype=code_dtype(len(guess)))
+
+    def code_matrix(self, guesses, pool):
+        """Returns the feedback codes of every guess (rows) against every answer in a pool."""
+
+        ids = self.answer_ids(pool)
+        if all(guess in self.guess_index for guess in guesses):
+            rows = [self.guess_index[guess] for guess in guesses]
+            return np.asarray(self.codes[np.ix_(rows, ids)])
+        return np.array([self.patterns(guess, ids) for guess in guesses])
+
+    def partition_sizes(self, guess, pool):
+        """Returns the number of pool answers that produce each feedback code."""
+
+        return np.bincount(self.patterns(guess, pool), minlength=3 ** len(guess))
+
+    def expectation(self, guess, pool):
+        """Computes the expected pool size that results from a particular guess.
+
+        This is the duplicate-aware analog of infomax.expectation, and can be used as the
+        cost_fn of a WordleAgent.
+        """
+
+        sizes = self.partition_sizes(guess, pool)
+        return float(np.dot(sizes, sizes)) / len(pool)
+
+    expectation.partition_invariant = True
+
+    def update_pool(self, guess, target, pool):
+        """Returns the subset of the pool that would give the same feedback as the target."""
+
+        code = feedback_code(guess, target)
+        keep = self.patterns(guess, pool) == code
+        if isinstance(pool, np.ndarray):
+            return pool[keep]
+        return [word for word, kept in zip(pool, keep) if kept]
+
+
+if __name__ == "__main__":
+    allowed_file = sys.argv[1]
+    answer_file = sys.argv[2]
+    matrix = FeedbackMatrix.from_files(allowed_file, answer_file)
+    print(f"Loaded a {matrix.codes.shape[0]} x {matrix.codes.shape[1]} feedback matrix.")
@@ -1,27 +1,83 @@
 import sys
-from collections import defaultdict
+import queue
+import signal
+from multiprocessing import Process, Queue
+from collections import defaultdict, deque
 from numpy import mean
 from random import choice, sample, shuffle
 from tqdm import tqdm
 from util import read_words
-from constraints import update_pool, get_constraint_colors
+from constraints import get_constraint_colors
 from infomax import expectation
 from agent import WordleAgent
+from simulate import play_one
+from adversary import play_adversary
 import pygame as pg
 from graphics import CartesianPlane, WordleLetter, WordleSlot, PlayButton, Histogram
 from interactive import BaseGame
 
 
+def _play_game(agent, allowed_guesses, pool, target, adversary):
+    if adversary is None:
+        return target, play_one(agent, allowed_guesses, pool, target)
+    adversary.reset()
+    return play_adversary(agent, allowed_guesses, pool, adversary)
+
+
+def _produce_games(agent, allowed_guesses, pool, targets, results, adversary):
+    # The forked producer inherits SDL's SIGTERM handler, which would keep it from stopping.
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    for target in targets:
+        results.put(_play_game(agent, allowed_guesses, pool, target, adversary))
+
+
 class WordlePlayer:
+    """Plays games of Wordle for a shuffled queue of targets.
 
-    def __init__(self, agent, allowed_guesses, pool):
+    Games are played synchronously by update, unless start has moved them to a background
+    process. That process feeds finished (target, guesses) results into a bounded queue
+    (pausing whenever buffer_size results are waiting), and update only collects them.
+    Once every target has been played, the targets are queued again in a new order (and
+    a finished background process is replaced).
+
+    If an adversary.Adversary is given, every game is played against it instead (one per
+    queued target, which it ignores), and each result holds the word it was left with.
+    """
+
+    def __init__(self, agent, allowed_guesses, pool, buffer_size=16, adversary=None):
         self.agent = agent
         self.allowed_guesses = allowed_guesses
         self.pool = pool
+        self.adversary = adversary
         self.results = []
-        self.target_queue = [word for word in self.pool]
-        shuffle(self.target_queue)
+        self.target_queue = deque()
+        self.refill()
         self.busy = False
+        self.result_queue = Queue(maxsize=buffer_size)
+        self.producer = None
+
+    def refill(self):
+        """Queues every target again, in a new random order."""
+
+        targets = list(self.pool)
+        shuffle(targets)
+        self.target_queue.extend(targets)
+
+    def start(self):
+        """Starts playing the queued targets in a background process."""
+
+        targets = list(self.target_queue)
+        self.target_queue.clear()
+        self.producer = Process(target=_produce_games, daemon=True,
+                                args=(self.agent, self.allowed_guesses, self.pool, targets,
+                                      self.result_queue, self.adversary))
+        self.producer.start()
+
+    def stop(self):
+        if self.producer is not None:
+            self.producer.terminate()
+            self.producer.join()
+            self.producer = None
 
     def most_recent_result(self):
         if len(self.results) > 0:
@@ -30,18 +86,7 @@ class WordlePlayer:
             return None
 
     def play_one(self, target):
-        guess = self.agent.first_guess()
-        guesses = [guess]
-        pool = [word for word in self.pool]
-        game_over = False
-        while not game_over:
-            if guess == target or len(guesses) == 6:
-                game_over = True
-            else:
-                pool = update_pool(guess, target, pool)
-                guess = self.agent.make_guess(self.allowed_guesses, pool)
-                guesses.append(guess)
-        return guesses
+        return _play_game(self.agent, self.allowed_guesses, self.pool, target, self.adversary)[1]
 
     def notify(self, event):
         pass
@@ -50,10 +95,25 @@ class WordlePlayer:
         self.update()
 
     def update(self):
+        if self.producer is not None:
+            try:
+                target, guesses = self.result_queue.get_nowait()
+            except queue.Empty:
+                if not self.producer.is_alive():
+                    # Every queued target has been played, so start over
+                    self.producer.join()
+                    self.refill()
+                    self.start()
+                return None
+            self.results.append((target, guesses))
+            return len(guesses)
+        if len(self.target_queue) == 0:
+            self.refill()
         if not self.busy and len(self.target_queue) > 0:
-            target, self.target_queue = self.target_queue[0], self.target_queue[1:]
+            target = self.target_queue.popleft()
             self.busy = True
-            guesses = self.play_one(target)
+            target, guesses = _play_game(self.agent, self.allowed_guesses, self.pool, target,
+                                         self.adversary)
             self.results.append((target, guesses))
             self.busy = False
             return len(guesses)
@@ -86,14 +146,16 @@ class WordleFlow(BaseGame):
             for x in range(1, 6):
                 self.plane.add_sprite(WordleSlot(x,y))
         self.player = WordlePlayer(agent, allowed_guesses, pool)
+        self.player.start()
         self.histogram = Histogram(x=330, y=305)
         self.plane.add_widget(self.histogram)
         self.target = None
         self.guess_queue = []
+        self.shown_result = None
 
     def refresh(self):
         self.round = 0
-        self.target, self.guess_queue = self.player.most_recent_result()
+        self.target, self.guess_queue = None, []
         self.plane.clear()
         for y in range(self.y_max-6, self.y_max):
             for x in range(1, 6):
@@ -104,29 +166,40 @@ class WordleFlow(BaseGame):
         end_game = False
         game_over = False
         active_letters = []
-        for _ in range(15):
-            num_guesses = self.player.update()
-            self.histogram.report_win(num_guesses)
         while not end_game and not (game_over and len(active_letters) == 0):
             for event in pg.event.get():
                 self.plane.notify(event)
                 if event.type == pg.QUIT:
                     game_over = True
                     end_game = True
-            if len(active_letters) == 0 and len(self.guess_queue) == 0:
+            if self.target is None:
+                # Games are played in the background, so the first one may still be running.
+                self.report_result()
+                result = self.player.most_recent_result()
+                if result is not None and result is not self.shown_result:
+                    self.shown_result = result
+                    self.target, self.guess_queue = result
+            elif len(active_letters) == 0 and len(self.guess_queue) == 0:
                 game_over = True
             elif len(active_letters) == 0:
                 self.round += 1
                 guess, self.guess_queue = self.guess_queue[0], self.guess_queue[1:]
                 active_letters = self.guess_word(guess)
-                num_guesses = self.player.update()
-                self.histogram.report_win(num_guesses)
+                self.report_result()
                 if guess == self.target or self.round > 6:
                     game_over = True
             active_letters = [letter for letter in active_letters if letter.active()]
             self.plane.refresh()
+            self.clock.tick(60)
         return end_game
 
+    def report_result(self):
+        """Adds the next finished game (if any) to the histogram, without waiting for one."""
+
+        num_guesses = self.player.update()
+        if num_guesses is not None:
+            self.histogram.report_win(num_guesses)
+
 
 if __name__ == "__main__":
     game = WordleFlow(WordleAgent(expectation, track_progress=False),
@@ -134,6 +207,7 @@ if __name__ == "__main__":
     going = True
     while going:
         if game.play():
+            game.player.stop()
             pg.quit()
             going = False
         else:
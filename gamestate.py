@@ -0,0 +1,170 @@
+import sys
+import numpy as np
+from util import read_words, Vocabulary, PoolView
+from infomax import encode_words, split_codes, fast_expectation
+from feedback import feedback_code
+
+
+def count_letters(letters):
+    """Counts the words with each byte at each position, given an (n, length) letter array.
+
+    Returns
+    -------
+    numpy.ndarray
+        An array of shape (length, 256)
+    """
+
+    positions = np.arange(letters.shape[1]) * 256
+    counts = np.bincount((letters.astype(np.intp) + positions).ravel(),
+                         minlength=256 * letters.shape[1])
+    return counts.reshape(letters.shape[1], 256)
+
+
+class GameState:
+    """The state of a game in progress: the pool of possible answers and structures derived
+    from it, which are maintained incrementally as feedback arrives.
+
+    The derived structures are
+    - letter_counts, where letter_counts[i, c] counts the pool words with byte c at
+      position i,
+    - the partition of the pool by the feedback codes of the most recent guess, and
+    - the agent's ranking of the candidate guesses (see ranking), which make_guess picks
+      from.
+
+    Once a guess's partition is known (e.g. because the agent just chose it), applying its
+    feedback only touches the words of the surviving partition.
+
+    Parameters
+    ----------
+    pool : list[str]
+        The pool of possible answers (a list, util.Vocabulary or util.PoolView)
+    feedback : feedback.FeedbackMatrix, optional
+        If provided, the pool is partitioned by its duplicate-aware feedback codes.
+        Otherwise, it is partitioned like constraints.update_pool (see infomax.split_codes).
+    """
+
+    def __init__(self, pool, feedback=None):
+        self.feedback = feedback
+        if feedback is not None:
+            vocabulary = Vocabulary(feedback.answers)
+            pool = vocabulary.pool(feedback.answer_ids(list(pool)))
+        elif not hasattr(pool, "letters"):
+            pool = Vocabulary(pool).pool()
+        elif isinstance(pool, Vocabulary):
+            pool = pool.pool()
+        self.pool = pool
+        self.history = []
+        self.partition_guess, self.partition = None, None
+        self.ranking_key, self.ranked = None, None
+        self.letter_counts = count_letters(self.pool.letters)
+
+    def __len__(self):
+        return len(self.pool)
+
+    def codes(self, guess):
+        """Returns the feedback code of a guess against every word of the pool."""
+
+        if self.feedback is not None:
+            return np.asarray(self.feedback.patterns(guess, self.pool.ids))
+        return split_codes([guess], self.pool)[0]
+
+    def code(self, guess, target):
+        """Returns the feedback code that a target produces for a guess."""
+
+        if self.feedback is not None:
+            return feedback_code(guess, target)
+        return int(split_codes([guess], [target])[0, 0])
+
+    def partition_by(self, guess):
+        """Partitions the pool by the feedback codes of a guess (remembering the result).
+
+        Returns
+        -------
+        dict[int, numpy.ndarray]
+            Maps each feedback code to the positions (in the pool) of the words producing it
+        """
+
+        if self.partition_guess != guess:
+            codes = self.codes(guess)
+            order = np.argsort(codes, kind="stable")
+            sorted_codes = codes[order]
+            starts = np.flatnonzero(np.diff(sorted_codes)) + 1
+            self.partition = dict(zip(sorted_codes[np.r_[0, starts]].tolist(),
+                                      np.split(order, starts)))
+            self.partition_guess = guess
+        return self.partition
+
+    def apply_feedback(self, guess, code):
+        """Narrows the pool to the words that produce a feedback code for a guess."""
+
+        # The partition holds each code's pool positions in increasing order (a stable
+        # sort), so the survivors can be taken as they are, in O(len(survivors)).
+        survivors = self.partition_by(guess).get(code, np.zeros(0, dtype=np.intp))
+        self.pool = PoolView(self.pool.vocabulary, self.pool.ids[survivors])
+        self.letter_counts = count_letters(self.pool.letters)
+        self.history.append((guess, code))
+        self.partition_guess, self.partition = None, None
+        self.ranking_key, self.ranked = None, None
+
+    def apply_target(self, guess, target):
+        """Narrows the pool after a guess, given the target word."""
+
+        self.apply_feedback(guess, self.code(guess, target))
+
+    def splitting_guesses(self, guesses):
+        """Drops the guesses that share no letter with any pool word (by letter_counts).
+
+        Such a guess gets all-gray feedback from every pool word, so it leaves the whole
+        pool in one part (and pruning would drop it). If every guess does, none is dropped.
+        """
+
+        present = self.letter_counts.sum(axis=0) > 0
+        splits = present[encode_words(guesses)].any(axis=1)
+        if not splits.any():
+            return guesses
+        return [guess for guess, kept in zip(guesses, splits) if kept]
+
+    def ranking(self, agent, guesses):
+        """Returns agent.rank_guesses(guesses, pool), computing it at most once per turn.
+
+        If the agent prunes its candidates, the guesses that cannot split the pool by their
+        letters alone are dropped first, which saves computing their feedback codes.
+        """
+
+        key = (id(agent), id(guesses))
+        if self.ranking_key != key:
+            if agent.prune and len(self.pool) >= 4:
+                guesses = self.splitting_guesses(guesses)
+            self.ranked = agent.rank_guesses(guesses, self.pool)
+            self.ranking_key = key
+        return self.ranked
+
+    def make_guess(self, agent, allowed_guesses):
+        """Picks the agent's guess from the cached ranking, and partitions the pool by it.
+
+        As in agent.WordleAgent.make_guess, a reply from the agent's opening book comes
+        first.
+        """
+
+        guess = None
+        if agent.book is not None:
+            answers = None if agent.feedback is None else agent.feedback.answers
+            guess = agent.book.reply(self.pool, answers)
+        if guess is None:
+            guess = self.ranking(agent, allowed_guesses)[0][1]
+        self.partition_by(guess)
+        return guess
+
+
+if __name__ == "__main__":
+    from agent import WordleAgent
+    allowed, answers = read_words(sys.argv[1]), read_words(sys.argv[2])
+    target = sys.argv[3]
+    agent = WordleAgent(fast_expectation, track_progress=False)
+    state = GameState(answers)
+    guess = agent.first_guess()
+    while guess != target:
+        state.apply_target(guess, target)
+        print(f"{guess}: {len(state)} possible answers remain")
+        guess = state.make_guess(agent, allowed)
+    print(f"Solved {target} after {len(state.history) + 1} guesses.")
@@ -1,5 +1,7 @@
 import numpy as np
 import os
+from time import perf_counter
+from collections import deque
 import pygame as pg
 
 
@@ -17,7 +19,69 @@ def load_image(filename, scale=None, colorkey=-1):
     return image, image.get_rect()
 
 
+class TileCache:
+    """The letter tiles, loaded and converted once, with their scaled variants.
+
+    The tiles are cut from the atlas written by lettergen.py (one row per color, with the
+    letters A to Z along each row) if it exists, and otherwise loaded from the individual
+    tile images. Either way, the display must have been set up first.
+    """
+
+    COLORS = ["gray", "yellow", "green"]
+    LETTERS = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+    def __init__(self, directory="images", atlas_file="tiles.png"):
+        self.tiles = {}
+        self.scaled = {}
+        atlas_path = os.path.join(directory, atlas_file)
+        if os.path.exists(atlas_path):
+            atlas = pg.image.load(atlas_path).convert()
+            width = atlas.get_width() // len(self.LETTERS)
+            height = atlas.get_height() // len(self.COLORS)
+            for row, color in enumerate(self.COLORS):
+                for column, letter in enumerate(self.LETTERS):
+                    area = pg.Rect(column * width, row * height, width, height)
+                    self.tiles[(letter, color)] = atlas.subsurface(area).copy()
+        else:
+            for color in self.COLORS:
+                for letter in self.LETTERS:
+                    filename = os.path.join(directory, f"{color}.{letter}.png")
+                    self.tiles[(letter, color)] = pg.image.load(filename).convert()
+
+    def tile(self, letter, color, scale=(1.0, 1.0)):
+        """Returns the (shared) surface of a letter tile, scaled like load_image would."""
+
+        key = (letter.upper(), color, scale)
+        if key not in self.scaled:
+            image = self.tiles[(letter.upper(), color)]
+            if scale != (1.0, 1.0):
+                size = image.get_size()
+                image = pg.transform.scale(image, (size[0] * scale[0], size[1] * scale[1]))
+            else:
+                image = image.copy()
+            image.set_colorkey(0, pg.RLEACCEL)
+            self.scaled[key] = image
+        return self.scaled[key]
+
+
+_tile_cache = None
+
+
+def get_tile_cache():
+    global _tile_cache
+    if _tile_cache is None:
+        _tile_cache = TileCache()
+    return _tile_cache
+
+
 class CartesianPlane:
+    """A screen whose sprites and widgets are positioned on a grid of cells.
+
+    Rendering is incremental: the sprites live in one persistent LayeredDirty group, and
+    each frame only redraws the sprites and widgets that changed (those with a dirty flag),
+    updating just their rectangles of the display. The plane also times every frame.
+    """
+
     def __init__(self, x_max, y_max, screen_width, screen_height,
                  bg_color=(255, 255, 255)):
         self.screen = pg.display.set_mode((screen_width, screen_height))
@@ -31,36 +95,66 @@ class CartesianPlane:
         self.y_pixel_increment = self.screen_height // self.y_max
         self.screen.blit(self.background, (0, 0))
         pg.display.flip()
-        self.sprite_list = []
-        self.sprites = pg.sprite.RenderPlain(self.sprite_list)
+        self.sprites = pg.sprite.LayeredDirty()
+        self.sprites.clear(self.screen, self.background)
         self.widgets = []
+        self.full_update = True
+        self.frames = 0
+        self.frame_times = deque(maxlen=300)
 
     def clear(self):
-        self.sprite_list = []
-        self.sprites = pg.sprite.RenderPlain(self.sprite_list)
+        self.sprites.empty()
         self.widgets = []
+        self.full_update = True
 
     def add_sprite(self, sprite):
-        self.sprite_list.append(sprite)
-        self.sprites = pg.sprite.RenderPlain(self.sprite_list)
+        self.sprites.add(sprite)
 
     def add_widget(self, widget):
         self.widgets.append(widget)
+        self.full_update = True
 
     def refresh(self):
-        self.screen.blit(self.background, (0, 0))
+        start = perf_counter()
         self.sprites.update()
         for sprite in self.sprites:
-            sprite.redraw()
             x, y = sprite.current_position()
             coords = self.translate_coordinates(x, y)
             if coords is not None:
                 width, height = sprite.size()
-                sprite.rect = coords[0] - width//2, coords[1] - height//2
-        self.sprites.draw(self.screen)
+                rect = pg.Rect(coords[0] - width//2, coords[1] - height//2, width, height)
+                if rect != sprite.rect:
+                    sprite.rect = rect
+                    sprite.dirty = 1
+        if self.full_update:
+            self.screen.blit(self.background, (0, 0))
+            self.sprites.repaint_rect(self.screen.get_rect())
+        dirty_rects = list(self.sprites.draw(self.screen))
         for widget in self.widgets:
-            widget.draw(self.screen)
-        pg.display.flip()
+            rect = getattr(widget, "rect", None)
+            if rect is None:
+                # Widgets that cannot say where they draw are redrawn on a full update.
+                self.full_update = True
+                widget.draw(self.screen)
+            elif self.full_update or getattr(widget, "dirty", True):
+                self.screen.blit(self.background, rect, rect)
+                widget.draw(self.screen)
+                widget.dirty = False
+                dirty_rects.append(rect)
+        if self.full_update:
+            pg.display.flip()
+        elif len(dirty_rects) > 0:
+            pg.display.update(dirty_rects)
+        self.full_update = False
+        self.frames += 1
+        self.frame_times.append(perf_counter() - start)
+
+    def frame_time(self):
+        """Returns the mean time (in seconds) that refresh took over the recent frames."""
+
+        if len(self.frame_times) == 0:
+            return 0.0
+        return sum(self.frame_times) / len(self.frame_times)
 
     def notify(self, event):
         for sprite in self.sprites:
@@ -76,14 +170,14 @@ class CartesianPlane:
                 self.screen_height - (y * self.y_pixel_increment))
 
 
-class WordleLetter(pg.sprite.Sprite):
+class WordleLetter(pg.sprite.DirtySprite):
 
     def __init__(self, letter, color, x, y):
-        pg.sprite.Sprite.__init__(self)
+        pg.sprite.DirtySprite.__init__(self)
         self.x, self.y = x, y
         self.cell_scale = (1.0, 1.0)
-        self.image_file = f"images/{color}.{letter}.png"
-        self.image, self.rect = load_image(self.image_file, scale=self.cell_scale, colorkey=0)
+        self.letter, self.color = letter, color
+        self.redraw()
         self.y_scale_queue = [1.0]
         self.y_pos_queue = []
 
@@ -113,21 +207,24 @@ class WordleLetter(pg.sprite.Sprite):
         self.y_pos_queue += list([self.y + .04*i for i in range(10, -1, -1)])
 
     def redraw(self):
-        self.image, self.rect = load_image(self.image_file, scale=self.cell_scale, colorkey=0)
+        self.image = get_tile_cache().tile(self.letter, self.color, self.cell_scale)
+        self.rect = self.image.get_rect()
 
     def update(self):
         if len(self.y_scale_queue) > 0:
             y_scale, self.y_scale_queue = self.y_scale_queue[0], self.y_scale_queue[1:]
-            self.cell_scale = (self.cell_scale[0], y_scale)
+            if y_scale != self.cell_scale[1]:
+                self.cell_scale = (self.cell_scale[0], y_scale)
+                self.redraw()
+                self.dirty = 1
         if len(self.y_pos_queue) > 0:
             self.y, self.y_pos_queue = self.y_pos_queue[0], self.y_pos_queue[1:]
-        self.redraw()
 
 
-class WordleSlot(pg.sprite.Sprite):
+class WordleSlot(pg.sprite.DirtySprite):
 
     def __init__(self, x, y):
-        pg.sprite.Sprite.__init__(self)
+        pg.sprite.DirtySprite.__init__(self)
         self.x, self.y = x, y
         self.cell_scale = (1.0, 1.0)
         self.image_file = f"images/slot.png"
@@ -146,7 +243,7 @@ class WordleSlot(pg.sprite.Sprite):
         self.image, self.rect = load_image(self.image_file, scale=self.cell_scale, colorkey=0)
 
     def update(self):
-        self.redraw()
+        pass
 
 
 class Histogram:
@@ -154,10 +251,17 @@ class Histogram:
     def __init__(self, x, y):
         self.x, self.y = x, y
         self.wins = [0, 0, 0, 0, 0, 0]
+        self.dirty = True
+
+    @property
+    def rect(self):
+        # Bars grow upwards from y (one pixel per win), above the labels and the average.
+        return pg.Rect(self.x, self.y - max(self.wins), 100, max(self.wins) + 60)
 
     def report_win(self, guess_count):
         if 1 <= guess_count <= len(self.wins):
             self.wins[guess_count-1] += 1
+            self.dirty = True
 
     def draw(self, screen):
         pg.draw.rect(screen, "gray", (self.x, self.y, 90, 1))
@@ -169,6 +273,8 @@ class Histogram:
             pg.draw.rect(screen, color, (self.x + 15 * guess_count,
                                          self.y - self.wins[guess_count],
                                          10, self.wins[guess_count]))
+        if sum(self.wins) == 0:
+            return
         average = sum([(i+1)*count for i, count in enumerate(self.wins)]) / sum(self.wins)
         average = f"{average:.2f}"
         myfont = pg.font.SysFont("monospace", 25)
@@ -179,14 +285,14 @@ class Histogram:
         pass
 
 
-class PlayButton(pg.sprite.Sprite):
+class PlayButton(pg.sprite.DirtySprite):
 
     def __init__(self, x, y):
-        pg.sprite.Sprite.__init__(self)
+        pg.sprite.DirtySprite.__init__(self)
         self.x, self.y = x, y
         self.cell_scale = (1, 1)
         self.image_file = f"images/play.png"
-        self.image, self.rect = load_image(self.image_file, colorkey=0)
+        self.redraw()
 
     def size(self):
         return self.rect.width, self.rect.height
@@ -202,6 +308,9 @@ class PlayButton(pg.sprite.Sprite):
 
     def redraw(self):
         self.image, self.rect = load_image(self.image_file, colorkey=0)
+        self.loaded_file = self.image_file
 
     def update(self):
-        self.redraw()
\ No newline at end of file
+        if self.image_file != self.loaded_file:
+            self.redraw()
+            self.dirty = 1
\ No newline at end of file
@@ -1,8 +1,8 @@
 import sys
 from collections import defaultdict
+import numpy as np
 from numpy import mean
 from random import choice, sample, shuffle
-from tqdm import tqdm
 from util import read_words
 from constraints import get_constraints, is_permitted
 
@@ -61,3 +61,128 @@ def expectation(guess, initial_pool):
         return result
     return expectation_recursive(initial_pool, position=0)
 
+
+expectation.word_pools = True
+
+
+def encode_words(words):
+    """Converts a list of equal-length words into an (n, length) array of byte codes.
+
+    Vocabularies and pool views (see util.Vocabulary) already store their words this way.
+    """
+
+    letters = getattr(words, "letters", None)
+    if letters is not None:
+        return letters
+    length = len(words[0]) if len(words) > 0 else 0
+    data = "".join(words).encode("ascii")
+    return np.frombuffer(data, dtype=np.uint8).reshape(len(words), length)
+
+
+def split_codes(guesses, pool):
+    """Computes the split_pool feedback of every guess against every pool word, at once.
+
+    Position i of a guess contributes 2 * 3**i if the pool word has the same letter at
+    position i, 1 * 3**i if the letter appears elsewhere in the pool word, and 0 otherwise.
+    Two pool words share a code iff expectation_recursive puts them in the same partition.
+
+    Parameters
+    ----------
+    guesses : list[str]
+        A list of candidate guesses
+    pool : list[str]
+        The current pool of possible answers
+
+    Returns
+    -------
+    numpy.ndarray
+        An int32 array of shape (len(guesses), len(pool))
+    """
+
+    guess_letters = encode_words(guesses)
+    pool_letters = encode_words(pool)
+    present = np.zeros((256, len(pool)), dtype=bool)
+    for position in range(pool_letters.shape[1]):
+        present[pool_letters[:, position], np.arange(len(pool))] = True
+    codes = np.zeros((len(guesses), len(pool)), dtype=np.int32)
+    for position in range(guess_letters.shape[1]):
+        letters = guess_letters[:, position]
+        green = letters[:, None] == pool_letters[None, :, position]
+        codes += 3 ** position * (green.astype(np.int32) + present[letters])
+    return codes
+
+
+def batch_expectation(guesses, pool, chunk_size=1024):
+    """Computes expectation(guess, pool) for every guess in a list, in batched NumPy operations.
+
+    Parameters
+    ----------
+    guesses : list[str]
+        A list of candidate guesses
+    pool : list[str]
+        The current pool of possible answers
+    chunk_size : int
+        Number of guesses to score per batch (bounds the memory used)
+
+    Returns
+    -------
+    numpy.ndarray
+        The expected pool size after each guess
+    """
+
+    num_codes = 3 ** len(pool[0])
+    costs = np.zeros(len(guesses))
+    for start in range(0, len(guesses), chunk_size):
+        codes = split_codes(guesses[start:start + chunk_size], pool)
+        rows = np.arange(codes.shape[0])[:, None] * num_codes
+        sizes = np.bincount((codes + rows).ravel(), minlength=codes.shape[0] * num_codes)
+        sizes = sizes.reshape(codes.shape[0], num_codes)
+        costs[start:start + chunk_size] = (sizes * sizes).sum(axis=1) / len(pool)
+    return costs
+
+
+def fast_expectation(guess, pool):
+    """Computes the same expected pool size as expectation, using batch_expectation.
+
+    Since it exposes batch_expectation as its batch attribute, a WordleAgent with this
+    cost function scores all of its candidate guesses in one batched call.
+    """
+
+    return float(batch_expectation([guess], pool)[0])
+
+
+fast_expectation.batch = batch_expectation
+fast_expectation.partition_invariant = True
+fast_expectation.word_pools = True
+
+
+def partition_labels(codes, solved_code):
+    """Relabels rows of feedback codes so that rows that partition the pool alike are equal.
+
+    Each code is replaced by the first position in its row where the code occurs, except
+    that solved_code (the all-green code) is replaced by the row length. Two guesses
+    get identical rows of labels iff they split the pool into the same parts and solve the
+    same pool word outright (if any).
+
+    Parameters
+    ----------
+    codes : numpy.ndarray
+        An array of shape (num_guesses, pool size), e.g. from split_codes
+    solved_code : int
+        The code of a guess that matches the pool word exactly
+
+    Returns
+    -------
+    numpy.ndarray
+        An array of labels with the same shape
+    """
+
+    num_guesses, n = codes.shape
+    # The smallest type that holds the row length keeps the table small for small pools
+    first = np.zeros((num_guesses, solved_code + 1), dtype=np.min_scalar_type(n))
+    guess_rows = np.arange(num_guesses)
+    for position in range(n - 1, -1, -1):
+        first[guess_rows, codes[:, position]] = position
+    labels = first[guess_rows[:, None], codes]
+    labels[codes == solved_code] = n
+    return labels
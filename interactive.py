@@ -4,9 +4,10 @@ from numpy import mean
 from random import choice, sample, shuffle
 from tqdm import tqdm
 from util import read_words
-from constraints import update_pool, get_constraint_colors
+from constraints import get_constraint_colors
 from infomax import expectation
 from agent import WordleAgent
+from gamestate import GameState
 import pygame as pg
 from graphics import CartesianPlane, WordleLetter, WordleSlot, PlayButton, Histogram
 
@@ -86,7 +87,7 @@ class WordleInteractive(BaseGame):
         game_over = False
         game_will_be_over = False
         guess = self.agent.first_guess()
-        pool = self.pool
+        state = GameState(self.pool)
         while not game_over:
             for event in pg.event.get():
                 self.plane.notify(event)
@@ -101,11 +102,11 @@ class WordleInteractive(BaseGame):
                     if guess == self.target:
                         game_will_be_over = True
                     else:
-                        pool = update_pool(guess, self.target, pool)
+                        state.apply_target(guess, self.target)
                         if self.round > 6:
                             game_will_be_over = True
                         else:
-                            guess = self.agent.make_guess(self.allowed_guesses, pool)
+                            guess = state.make_guess(self.agent, self.allowed_guesses)
             self.plane.refresh()
         return end_game
 
@@ -1,6 +1,10 @@
+import sys
 from PIL import Image, ImageDraw, ImageFont
 
 
+LETTERS = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+
+
 def create_letter_image(letter, color):
     if color == "green":
         rgb = (121, 168, 107)
@@ -16,8 +20,25 @@ def create_letter_image(letter, color):
     draw.text(((width - w) / 2, (height - h) / 2), letter, fill="white", font=font)
     im.save(f"images/{color}.{letter}.png", format="png")
 
+
+def create_atlas(filename="images/tiles.png"):
+    """Packs the letter tiles into a single image: one row per color (gray, yellow, green),
+    with the letters A to Z in order along each row."""
+
+    colors = ["gray", "yellow", "green"]
+    tile_width, tile_height = Image.open("images/gray.A.png").size
+    atlas = Image.new("RGBA", size=(len(LETTERS) * tile_width, len(colors) * tile_height))
+    for row, color in enumerate(colors):
+        for column, letter in enumerate(LETTERS):
+            tile = Image.open(f"images/{color}.{letter}.png")
+            atlas.paste(tile, (column * tile_width, row * tile_height))
+    atlas.save(filename, format="png")
+
+
 if __name__ == "__main__":
-    for ltr in 'ABCDEFGHIJKLMNOPQRSTUVWXYZ':
-        create_letter_image(ltr, "green")
-        create_letter_image(ltr, "yellow")
-        create_letter_image(ltr, "gray")
+    if "--atlas-only" not in sys.argv:
+        for ltr in LETTERS:
+            create_letter_image(ltr, "green")
+            create_letter_image(ltr, "yellow")
+            create_letter_image(ltr, "gray")
+    create_atlas()
@@ -0,0 +1,158 @@
+import sys
+from time import perf_counter
+from collections import OrderedDict
+import numpy as np
+from util import read_words
+from infomax import fast_expectation
+from agent import WordleAgent
+
+
+class LookaheadAgent(WordleAgent):
+    """A WordleAgent that looks two guesses ahead, within a compute budget.
+
+    The greedy scorer (cost_fn) shortlists the top_k candidate guesses. Each of them is
+    then valued by a second ply over its feedback partitions: every partition is solved
+    with the best follow-up guess among all allowed guesses, where the guesses left after
+    that are estimated by the lower bound of expectimax.ExpectimaxSolver (a pool of size m
+    needs at least 2 - 1/m more guesses). The candidate with the lowest expected number of
+    guesses wins, ties going to the greedy order (see rank_guesses).
+
+    Partition values only depend on the partition (and the allowed guesses), so they are
+    cached and shared across candidates and turns, in an LRU cache of part_cache_size
+    entries. When the budget runs out, the best
+    fully evaluated candidate is returned (the greedy choice, if none was).
+
+    Parameters
+    ----------
+    cost_fn : function
+        The greedy cost function (see agent.WordleAgent)
+    top_k : int
+        Number of greedy candidates evaluated by the second ply
+    time_budget : float, optional
+        Maximum number of seconds spent on the second ply of a turn
+    node_budget : int, optional
+        Maximum number of partitions evaluated (excluding cache hits) per turn
+    part_cache_size : int
+        Maximum number of cached partition values (0 disables the cache)
+    kwargs
+        Other arguments of agent.WordleAgent
+    """
+
+    def __init__(self, cost_fn, top_k=10, time_budget=None, node_budget=None,
+                 part_cache_size=65536, **kwargs):
+        super().__init__(cost_fn, **kwargs)
+        self.top_k = top_k
+        self.time_budget = time_budget
+        self.node_budget = node_budget
+        self.part_cache_size = part_cache_size
+        self.part_values = OrderedDict()
+        self.nodes, self.part_hits = 0, 0
+        self.last_evaluated, self.budget_exhausted = 0, False
+
+    def clear_cache(self):
+        super().clear_cache()
+        self.part_values.clear()
+
+    def rank_guesses(self, allowed_guesses, pool):
+        """Ranks the candidate guesses for a pool, best first.
+
+        The evaluated candidates come first, by their expected number of guesses (ties
+        going to the greedy order), followed by the others with their greedy costs.
+        """
+
+        if len(pool) < 4:
+            return super().rank_guesses(allowed_guesses, pool)
+        pool = list(pool)
+        candidates = allowed_guesses
+        if self.prune:
+            candidates = self.prune_candidates(allowed_guesses, pool)
+        scored = self.score_guesses(candidates, pool)
+        ranked = [guess for _, guess in scored[:self.top_k]]
+        deadline = None if self.time_budget is None else perf_counter() + self.time_budget
+        self.nodes, self.last_evaluated, self.budget_exhausted = 0, 0, False
+        evaluated = []
+        for guess, codes in zip(ranked, self.candidate_codes(ranked, pool)):
+            value = self.lookahead_value(allowed_guesses, pool, codes, deadline)
+            if value is None:
+                self.budget_exhausted = True
+                break
+            self.last_evaluated += 1
+            evaluated.append((value, len(evaluated), guess))
+        return [(value, guess) for value, _, guess in sorted(evaluated)] + scored[len(evaluated):]
+
+    def lookahead_value(self, allowed_guesses, pool, codes, deadline):
+        """Computes the expected number of guesses needed after guessing a candidate.
+
+        Parameters
+        ----------
+        allowed_guesses : list[str]
+            List of allowable guesses
+        pool : list[str]
+            Pool of possible answers
+        codes : numpy.ndarray
+            The feedback codes of the candidate against the pool
+        deadline : float
+            The perf_counter time at which the search stops (None for no deadline)
+
+        Returns
+        -------
+        float
+            The expected number of guesses (counting the candidate), or None if the budget
+            ran out first
+        """
+
+        solved_code = 3 ** len(pool[0]) - 1
+        order = np.argsort(codes, kind="stable")
+        sorted_codes = codes[order]
+        starts = np.flatnonzero(np.diff(sorted_codes)) + 1
+        total = 0.0
+        for code, part in zip(sorted_codes[np.r_[0, starts]], np.split(order, starts)):
+            if code != solved_code:
+                value = self.part_value(allowed_guesses, [pool[i] for i in part], deadline)
+                if value is None:
+                    return None
+                total += len(part) * value
+        return 1 + total / len(pool)
+
+    def part_value(self, allowed_guesses, part, deadline):
+        """Estimates the expected number of guesses needed to solve a partition.
+
+        Returns
+        -------
+        float
+            The estimate, or None if the budget ran out before it could be computed
+        """
+
+        m = len(part)
+        if m <= 2:
+            return 1 + (m - 1) / m
+        key = self.pool_fingerprint(allowed_guesses, part)
+        if key in self.part_values:
+            self.part_hits += 1
+            self.part_values.move_to_end(key)
+            return self.part_values[key]
+        if ((deadline is not None and perf_counter() > deadline) or
+                (self.node_budget is not None and self.nodes >= self.node_budget)):
+            return None
+        self.nodes += 1
+        codes = np.sort(self.candidate_codes(allowed_guesses, part), axis=1)
+        solved = (codes[:, -1] == 3 ** len(part[0]) - 1).astype(np.int64)
+        parts = 1 + np.count_nonzero(np.diff(codes, axis=1), axis=1) - solved
+        value = float((1 + (2 * (m - solved) - parts) / m).min())
+        if self.part_cache_size > 0:
+            self.part_values[key] = value
+            if len(self.part_values) > self.part_cache_size:
+                self.part_values.popitem(last=False)
+        return value
+
+
+if __name__ == "__main__":
+    from simulate import simulate, summarize
+    allowed_file = sys.argv[1]
+    answer_file = sys.argv[2]
+    time_budget = float(sys.argv[3]) if len(sys.argv) > 3 else None
+    allowed, answers = read_words(allowed_file), read_words(answer_file)
+    agent = LookaheadAgent(fast_expectation, track_progress=False, time_budget=time_budget)
+    summary = summarize(simulate(agent, allowed, answers))
+    print(f"Played {summary['games']} games: mean of {summary['mean_guesses']:.4f} guesses, "
+          f"{summary['failures']} failures.")
@@ -1,9 +1,11 @@
-import sys
+import argparse
 from abc import ABC, abstractmethod
-from numpy import mean
+from statistics import NormalDist
+import numpy as np
 from random import sample
 from util import read_words
 from constraints import get_constraints, is_permitted
+from infomax import split_codes
 
 
 def reduction(guess, target, pool):
@@ -29,26 +31,114 @@ def reduction(guess, target, pool):
     return len(permitted) / len(pool)
 
 
+def target_reductions(guesses, targets, pool):
+    """Computes reduction(guess, target, pool) for every guess and target, in batched operations.
+
+    Two targets leave the same words of the pool possible iff they produce the same
+    infomax.split_codes feedback, so the reduction for a target is the fraction of the pool
+    that shares its feedback code. This takes O(guesses * (targets + pool)) time.
+
+    Parameters
+    ----------
+    guesses : list[str]
+        The guessed words
+    targets : list[str]
+        The possible secret target words
+    pool : list[str]
+        The pool of possible guesses, prior to the current guess
+
+    Returns
+    -------
+    numpy.ndarray
+        An array of shape (len(guesses), len(targets))
+    """
+
+    num_codes = 3 ** len(pool[0])
+    pool_codes = split_codes(guesses, pool)
+    rows = np.arange(len(guesses))[:, None] * num_codes
+    counts = np.bincount((pool_codes + rows).ravel(), minlength=len(guesses) * num_codes)
+    target_codes = split_codes(guesses, targets)
+    return counts[target_codes + rows] / len(pool)
+
+
+def batch_expected_reduction(guesses, targets, pool, chunk_size=256):
+    """Computes expected_reduction(guess, targets, pool) for every guess in a list."""
+
+    result = np.zeros(len(guesses))
+    for start in range(0, len(guesses), chunk_size):
+        chunk = guesses[start:start + chunk_size]
+        result[start:start + chunk_size] = target_reductions(chunk, targets, pool).mean(axis=1)
+    return result
+
+
 def expected_reduction(guess, targets, pool):
-    return mean([reduction(guess, target, pool) for target in targets])
+    return float(batch_expected_reduction([guess], targets, pool)[0])
+
+
+def pool_reduction(guess, pool):
+    """Computes the expected reduction of a guess when every pool word is a possible target.
+
+    This adapts expected_reduction to the cost_fn interface of agent.WordleAgent.
+    """
+
+    return expected_reduction(guess, pool, pool)
+
+
+def batch_pool_reduction(guesses, pool):
+    return batch_expected_reduction(guesses, pool, pool)
+
+
+pool_reduction.batch = batch_pool_reduction
+pool_reduction.partition_invariant = True
+pool_reduction.word_pools = True
 
 
 def best_expected_reduction(targets, pool):
-    eps = 0.000001
-    best, best_reduction = None, 1.0 + eps
-    for guess in pool:
-        guess_reduction = expected_reduction(guess, targets, pool)
-        if guess_reduction < best_reduction:
-            best, best_reduction = guess, guess_reduction
-    return best
-
-
-def montecarlo(num_samples):
-    allowed = read_words('wordle-allowed-guesses.txt')
-    subset = sample(allowed, num_samples)
-    best_guess = best_expected_reduction(subset, subset)
-    print(f"From a random pool of {num_samples} words:")
-    print(f"  the best first guess is {best_guess}")
+    reductions = batch_expected_reduction(pool, targets, pool)
+    return pool[int(np.argmin(reductions))]
+
+
+def sampled_reductions(guesses, targets, pool, confidence=0.95, chunk_size=256):
+    """Estimates the expected reduction of each guess from a sample of targets.
+
+    Parameters
+    ----------
+    guesses : list[str]
+        The guessed words
+    targets : list[str]
+        A random sample of the possible targets
+    pool : list[str]
+        The pool of possible guesses, prior to the current guess
+    confidence : float
+        Confidence level of the intervals
+
+    Returns
+    -------
+    numpy.ndarray, numpy.ndarray
+        The estimated expected reduction of each guess, and the half-width of its
+        confidence interval
+    """
+
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    means, half_widths = np.zeros(len(guesses)), np.zeros(len(guesses))
+    for start in range(0, len(guesses), chunk_size):
+        chunk = guesses[start:start + chunk_size]
+        reductions = target_reductions(chunk, targets, pool)
+        means[start:start + chunk_size] = reductions.mean(axis=1)
+        if len(targets) > 1:
+            deviations = reductions.std(axis=1, ddof=1)
+            half_widths[start:start + chunk_size] = z * deviations / np.sqrt(len(targets))
+    return means, half_widths
+
+
+def montecarlo(wordfile, num_samples, confidence=0.95, top=5):
+    allowed = read_words(wordfile)
+    targets = sample(allowed, num_samples)
+    means, half_widths = sampled_reductions(allowed, targets, allowed, confidence)
+    print(f"From {num_samples} random targets in the pool of {len(allowed)} words:")
+    for i in np.argsort(means, kind="stable")[:top]:
+        print(f"  {allowed[i]}: expected reduction {means[i]:.5f} +/- {half_widths[i]:.5f}"
+              f" ({confidence:.0%} confidence)")
 
 
 def main(wordfile, max_words=None):
@@ -61,4 +151,14 @@ def main(wordfile, max_words=None):
 
 
 if __name__ == "__main__":
-    main(sys.argv[1], int(sys.argv[2]))
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Finds the guess with the best expected reduction.")
+    parser.add_argument("wordfile")
+    parser.add_argument("max_words", type=int, nargs="?", help="only use the first MAX_WORDS words")
+    parser.add_argument("--samples", type=int,
+                        help="estimate from this many sampled targets (with confidence intervals)")
+    parser.add_argument("--confidence", type=float, default=0.95)
+    args = parser.parse_args()
+    if args.samples is not None:
+        montecarlo(args.wordfile, args.samples, args.confidence)
+    else:
+        main(args.wordfile, args.max_words)
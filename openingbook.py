@@ -0,0 +1,202 @@
+import sys
+import json
+from collections import defaultdict
+
+
+# The NumPy-backed modules are imported where they are needed, so that a book can answer
+# a query without loading them (see wordle.py).
+BOOK_VERSION = 2
+
+
+def opener_codes(opener, pool, duplicate_aware=False):
+    """Computes the feedback code of every pool word for the opener.
+
+    Returns
+    -------
+    list[int]
+        The duplicate-aware codes of feedback.feedback_code, or the codes of
+        infomax.split_codes (which match constraints.update_pool)
+    """
+
+    if duplicate_aware:
+        from feedback import feedback_code
+        return [feedback_code(opener, word) for word in pool]
+    from infomax import split_codes
+    return [int(code) for code in split_codes([opener], pool)[0]]
+
+
+def colors_code(guess, colors, duplicate_aware=False):
+    """Converts the colors shown for a guess into a feedback code, without any word list.
+
+    Parameters
+    ----------
+    guess : str
+        The guessed word
+    colors : str
+        One character per letter: g for green, y for yellow, anything else for gray
+    duplicate_aware : bool
+        Whether to return the code of feedback.feedback_code (rather than a split code)
+
+    Returns
+    -------
+    int
+        The feedback code. A split code marks a letter yellow whenever the target contains
+        it, which is the case iff some occurrence of the letter in the guess is not gray.
+    """
+
+    colors = colors.lower()
+    found = {letter for letter, color in zip(guess, colors) if color in "gy"}
+    code = 0
+    for pos, (letter, color) in enumerate(zip(guess, colors)):
+        if color == "g":
+            code += 2 * 3 ** pos
+        elif (color == "y") if duplicate_aware else (letter in found):
+            code += 3 ** pos
+    return code
+
+
+class OpeningBook:
+    """The precomputed first guess of an agent, and its second guess after every feedback.
+
+    Parameters
+    ----------
+    opener : str
+        The first guess
+    replies : dict[int, tuple]
+        Maps each feedback code for the opener to a (second guess, pool size) pair, where
+        the pool size is the number of answers that produce the code
+    duplicate_aware : bool
+        Whether the codes are those of feedback.feedback_code (rather than split codes)
+    key : str, optional
+        The feedback.cache_key of the word lists the book was built for
+    partitions : dict[int, frozenset], optional
+        Maps each feedback code to the answers that produce it. Without a code's partition,
+        reply cannot recognize its pool (but reply_to still answers the code).
+    """
+
+    def __init__(self, opener, replies, duplicate_aware=False, key=None, partitions=None):
+        self.opener = opener
+        self.replies = replies
+        self.duplicate_aware = duplicate_aware
+        self.key = key
+        self.partitions = {} if partitions is None else partitions
+
+    def reply(self, pool, answers=None):
+        """Looks up the second guess for the pool left after the opener.
+
+        The pool's feedback code is that of any of its words, and the pool gets the reply
+        for that code iff it holds exactly the code's partition. Pools that merely share a
+        word's code and the partition's size (e.g. after some other first guess) do not.
+
+        Parameters
+        ----------
+        pool : list[str]
+            The pool of possible answers, or an array of answer ids
+        answers : list[str], optional
+            The words that answer ids stand for (e.g. feedback.FeedbackMatrix.answers),
+            required if the pool is an array of ids
+
+        Returns
+        -------
+        str
+            The second guess, or None if the pool is not a second-turn pool of the book
+        """
+
+        if len(pool) == 0:
+            return None
+        words = pool
+        if not isinstance(pool[0], str):
+            if answers is None:
+                raise ValueError("A pool of answer ids requires the answers they stand for")
+            words = [answers[i] for i in pool]
+        code = opener_codes(self.opener, [words[0]], self.duplicate_aware)[0]
+        partition = self.partitions.get(code)
+        if partition is None or len(partition) != len(words):
+            return None
+        if all(word in partition for word in words):
+            return self.replies[code][0]
+        return None
+
+    def reply_to(self, code):
+        """Returns the second guess after a feedback code for the opener (or None)."""
+
+        reply = self.replies.get(code)
+        return None if reply is None else reply[0]
+
+
+def build_book(agent, allowed_guesses, pool, opener=None):
+    """Computes an agent's best opener, and its reply to every feedback for that opener.
+
+    Parameters
+    ----------
+    agent : agent.WordleAgent
+        AI whose guesses are recorded (without a book of its own)
+    allowed_guesses : list[str]
+        List of allowable guesses
+    pool : list[str]
+        Pool of possible answers
+    opener : str, optional
+        The first guess (by default, the agent's best guess for the whole pool)
+
+    Returns
+    -------
+    OpeningBook
+        The opening book
+    """
+
+    from feedback import cache_key
+    pool = list(pool)
+    if opener is None:
+        opener = agent.make_guess(allowed_guesses, pool)
+    duplicate_aware = agent.feedback is not None
+    partitions = defaultdict(list)
+    for word, code in zip(pool, opener_codes(opener, pool, duplicate_aware)):
+        partitions[code].append(word)
+    replies = {}
+    for code, subpool in sorted(partitions.items()):
+        replies[code] = (agent.make_guess(allowed_guesses, subpool), len(subpool))
+    return OpeningBook(opener, replies, duplicate_aware, cache_key(allowed_guesses, pool),
+                       {code: frozenset(subpool) for code, subpool in partitions.items()})
+
+
+def save_book(book, filename):
+    with open(filename, "w") as writer:
+        json.dump({"version": BOOK_VERSION, "key": book.key, "opener": book.opener,
+                   "duplicate_aware": book.duplicate_aware,
+                   "replies": {code: list(reply) for code, reply in book.replies.items()},
+                   "partitions": {code: sorted(partition)
+                                  for code, partition in book.partitions.items()}},
+                  writer, separators=(",", ":"))
+
+
+def load_book(filename, allowed_guesses=None, pool=None):
+    """Loads a book saved by save_book.
+
+    If word lists are given, they must be the ones the book was built for.
+    """
+
+    with open(filename) as reader:
+        data = json.load(reader)
+    if data["version"] != BOOK_VERSION:
+        raise ValueError(f"Unsupported opening book version: {data['version']}")
+    if allowed_guesses is not None and pool is not None:
+        from feedback import cache_key
+        if data["key"] != cache_key(list(allowed_guesses), list(pool)):
+            raise ValueError(f"The opening book {filename} was built for other word lists")
+    replies = {int(code): tuple(reply) for code, reply in data["replies"].items()}
+    partitions = {int(code): frozenset(partition)
+                  for code, partition in data["partitions"].items()}
+    return OpeningBook(data["opener"], replies, data["duplicate_aware"], data["key"], partitions)
+
+
+if __name__ == "__main__":
+    from util import read_words
+    from infomax import fast_expectation
+    from agent import WordleAgent
+    allowed_file = sys.argv[1]
+    answer_file = sys.argv[2]
+    book_file = sys.argv[3]
+    agent = WordleAgent(fast_expectation, track_progress=False)
+    book = build_book(agent, read_words(allowed_file), read_words(answer_file))
+    save_book(book, book_file)
+    print(f"Saved the opening book for {book.opener} ({len(book.replies)} replies) to {book_file}.")
@@ -0,0 +1,303 @@
+import json
+import time
+import asyncio
+import argparse
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from util import Vocabulary
+from infomax import encode_words, fast_expectation
+from feedback import COLOR_CODES, encode_feedback, feedback_code
+from agent import WordleAgent
+from simulate import MAX_GUESSES
+
+
+def parse_feedback(feedback):
+    """Converts feedback (a base-3 code, or a list of color names) into a feedback code."""
+
+    if isinstance(feedback, int):
+        return feedback
+    return sum(COLOR_CODES[color] * 3 ** pos for pos, color in enumerate(feedback))
+
+
+class GameSession:
+    """A headless game of Wordle, whose target is unknown to the agent.
+
+    The pool of possible answers is narrowed incrementally: each piece of feedback only
+    filters the words that survived the previous one.
+
+    Parameters
+    ----------
+    answers : util.Vocabulary
+        The possible answers
+    first_guess : str
+        The guess to make before any feedback arrives
+    """
+
+    def __init__(self, answers, first_guess):
+        self.pool = answers.pool()
+        self.guesses = []
+        self.next_guess = first_guess
+        self.solved = False
+
+    def apply_feedback(self, guess, feedback):
+        """Removes the pool words that would not have produced the feedback for a guess.
+
+        Parameters
+        ----------
+        guess : str
+            The guessed word
+        feedback : int or list[str]
+            The feedback code (see feedback.feedback_code), or a list of color names
+        """
+
+        code = parse_feedback(feedback)
+        self.guesses.append(guess)
+        self.solved = code == 3 ** len(guess) - 1
+        codes = encode_feedback(encode_words([guess]), self.pool.letters)[0]
+        self.pool = self.pool.subset(codes == code)
+        self.next_guess = None
+
+
+_worker_state = None
+
+
+def _initialize_worker(agent, allowed_guesses, answers):
+    global _worker_state
+    _worker_state = (agent, allowed_guesses, answers)
+
+
+def _worker_guess(ids):
+    agent, allowed_guesses, answers = _worker_state
+    return agent.make_guess(allowed_guesses, answers.pool(ids))
+
+
+class GuessService:
+    """Serves the guesses of a WordleAgent to many concurrent game sessions.
+
+    Guesses are computed in a pool of worker processes, so the event loop never blocks.
+    Concurrent requests for the same pool are coalesced into a single computation, and
+    the guesses for recent pools are remembered (evicting the least recently used first).
+
+    The protocol is newline-delimited JSON over TCP. Each request is an object with an
+    "op" field:
+    - {"op": "new"} starts a session,
+    - {"op": "feedback", "session": id, "feedback": code or colors} reports the feedback
+      for the session's last guess (or for an explicit "guess"),
+    - {"op": "close", "session": id} ends a session, and
+    - {"op": "stats"} reports the service counters.
+    The replies to "new" and "feedback" hold the session id, the next guess (null once the
+    game is solved) and the pool size. Failed requests get an {"error": message} reply.
+
+    Parameters
+    ----------
+    agent : agent.WordleAgent
+        AI whose guesses are served
+    allowed_guesses : list[str]
+        List of allowable guesses
+    answers : util.Vocabulary
+        The possible answers
+    num_workers : int
+        Number of processes that compute guesses
+    cache_size : int
+        Maximum number of pools whose guesses are remembered
+    """
+
+    def __init__(self, agent, allowed_guesses, answers, num_workers=1, cache_size=4096):
+        self.agent = agent
+        self.answers = answers
+        self.executor = ProcessPoolExecutor(max_workers=num_workers,
+                                            initializer=_initialize_worker,
+                                            initargs=(agent, allowed_guesses, answers))
+        self.cache_size = cache_size
+        self.results = OrderedDict()
+        self.pending = {}
+        self.sessions = {}
+        self.next_session = 0
+        self.computed, self.coalesced, self.cache_hits = 0, 0, 0
+
+    async def compute_guess(self, ids):
+        """Computes the agent's guess for a pool, given as an array of answer ids."""
+
+        if len(ids) == 1:
+            return self.answers[ids[0]]
+        key = ids.tobytes()
+        if key in self.results:
+            self.cache_hits += 1
+            self.results.move_to_end(key)
+            return self.results[key]
+        future = self.pending.get(key)
+        if future is None:
+            self.computed += 1
+            future = asyncio.get_running_loop().run_in_executor(self.executor, _worker_guess, ids)
+            future.add_done_callback(lambda done: self.finish_guess(key, done))
+            self.pending[key] = future
+        else:
+            self.coalesced += 1
+        # Shielded, so that a client disconnecting does not cancel the other waiters.
+        return await asyncio.shield(future)
+
+    def finish_guess(self, key, future):
+        del self.pending[key]
+        if not future.cancelled() and future.exception() is None:
+            self.results[key] = future.result()
+            if len(self.results) > self.cache_size:
+                self.results.popitem(last=False)
+
+    async def handle(self, request):
+        """Computes the reply to a single request."""
+
+        op = request.get("op")
+        if op == "new":
+            session_id = self.next_session
+            self.next_session += 1
+            session = GameSession(self.answers, self.agent.first_guess())
+            self.sessions[session_id] = session
+        elif op == "feedback":
+            session_id = request["session"]
+            session = self.sessions[session_id]
+            guess = request.get("guess", session.next_guess)
+            if guess is None:
+                raise ValueError("No guess to apply the feedback to")
+            session.apply_feedback(guess, request["feedback"])
+            if len(session.pool) == 0:
+                raise ValueError("No possible answer is consistent with the feedback")
+            if not session.solved:
+                session.next_guess = await self.compute_guess(session.pool.ids)
+        elif op == "close":
+            del self.sessions[request["session"]]
+            return {"closed": True}
+        elif op == "stats":
+            return {"sessions": len(self.sessions), "computed": self.computed,
+                    "coalesced": self.coalesced, "cache_hits": self.cache_hits}
+        else:
+            raise ValueError(f"Unknown op: {op!r}")
+        return {"session": session_id, "guess": session.next_guess, "pool_size": len(session.pool)}
+
+    async def handle_client(self, reader, writer):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    reply = await self.handle(json.loads(line))
+                except (KeyError, ValueError, TypeError) as error:
+                    reply = {"error": f"{type(error).__name__}: {error}"}
+                writer.write(json.dumps(reply).encode() + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host="127.0.0.1", port=8765):
+        return await asyncio.start_server(self.handle_client, host, port)
+
+    def close(self):
+        self.executor.shutdown(cancel_futures=True)
+
+
+async def play_remote(reader, writer, target, latencies):
+    """Plays a game against the service, answering its guesses with the target's feedback.
+
+    Returns
+    -------
+    list[str]
+        The guesses made (at most six)
+    """
+
+    async def request(message):
+        start = time.perf_counter()
+        writer.write(json.dumps(message).encode() + b"\n")
+        await writer.drain()
+        reply = json.loads(await reader.readline())
+        latencies.append(time.perf_counter() - start)
+        if "error" in reply:
+            raise RuntimeError(reply["error"])
+        return reply
+
+    reply = await request({"op": "new"})
+    session_id, guesses = reply["session"], []
+    while reply["guess"] is not None and len(guesses) < MAX_GUESSES:
+        guesses.append(reply["guess"])
+        reply = await request({"op": "feedback", "session": session_id,
+                               "feedback": feedback_code(reply["guess"], target)})
+    await request({"op": "close", "session": session_id})
+    return guesses
+
+
+async def load_test(targets, host="127.0.0.1", port=8765, concurrency=16):
+    """Plays a game for every target over concurrent connections to a running service.
+
+    Returns
+    -------
+    dict
+        The numbers of games, requests and failures, the throughput (requests per
+        second) and the latency percentiles of the requests, in milliseconds
+    """
+
+    queue = deque(targets)
+    latencies, results = [], {}
+
+    async def client():
+        reader, writer = await asyncio.open_connection(host, port)
+        try:
+            while len(queue) > 0:
+                target = queue.popleft()
+                results[target] = await play_remote(reader, writer, target, latencies)
+        finally:
+            writer.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*[client() for _ in range(concurrency)])
+    seconds = time.perf_counter() - start
+    latencies = 1000 * np.array(latencies)
+    return {"games": len(results), "requests": len(latencies), "seconds": seconds,
+            "failures": sum(guesses[-1] != target for target, guesses in results.items()),
+            "throughput": len(latencies) / seconds,
+            "p50_ms": float(np.percentile(latencies, 50)),
+            "p99_ms": float(np.percentile(latencies, 99)),
+            "max_ms": float(latencies.max())}
+
+
+async def serve(args):
+    agent = WordleAgent(fast_expectation, track_progress=False)
+    service = GuessService(agent, Vocabulary.from_file(args.allowed_file),
+                           Vocabulary.from_file(args.answer_file), num_workers=args.workers)
+    server = await service.start(args.host, args.port)
+    print(f"Serving guesses on {args.host}:{args.port}.")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description="Serves Wordle guesses to concurrent games.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    commands = parser.add_subparsers(dest="command", required=True)
+    serve_parser = commands.add_parser("serve", help="run the guessing service")
+    serve_parser.add_argument("allowed_file")
+    serve_parser.add_argument("answer_file")
+    serve_parser.add_argument("--workers", type=int, default=1, help="number of processes")
+    load_parser = commands.add_parser("loadtest", help="play games against a running service")
+    load_parser.add_argument("answer_file")
+    load_parser.add_argument("--games", type=int, default=200)
+    load_parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args(args)
+    if args.command == "serve":
+        asyncio.run(serve(args))
+    else:
+        targets = Vocabulary.from_file(args.answer_file).words[:args.games]
+        report = asyncio.run(load_test(targets, args.host, args.port, args.concurrency))
+        print(f"Played {report['games']} games ({report['failures']} failures) with "
+              f"{report['requests']} requests in {report['seconds']:.2f}s: "
+              f"{report['throughput']:.1f} requests/s, p50 {report['p50_ms']:.2f} ms, "
+              f"p99 {report['p99_ms']:.2f} ms.")
+
+
+if __name__ == "__main__":
+    main()
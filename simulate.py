@@ -0,0 +1,170 @@
+import csv
+import json
+import argparse
+from collections import Counter
+from util import Vocabulary
+from constraints import update_pool
+from infomax import fast_expectation
+from agent import WordleAgent
+from telemetry import TelemetryRecorder
+from openingbook import load_book
+
+
+MAX_GUESSES = 6
+
+
+def play_one(agent, allowed_guesses, pool, target):
+    """Plays a single game of Wordle, without any graphics.
+
+    Parameters
+    ----------
+    agent : agent.WordleAgent
+        AI who will play Wordle
+    allowed_guesses : list[str]
+        List of allowable guesses
+    pool : list[str]
+        Pool of possible answers
+    target : str
+        The hidden target word for this game
+
+    Returns
+    -------
+    list[str]
+        The agent's guesses, in order (at most six)
+    """
+
+    guess = agent.first_guess()
+    guesses = [guess]
+    game_over = False
+    while not game_over:
+        if guess == target or len(guesses) == MAX_GUESSES:
+            game_over = True
+        else:
+            pool = update_pool(guess, target, pool, feedback=agent.feedback,
+                               instrument=getattr(agent, "instrument", None))
+            guess = agent.make_guess(allowed_guesses, pool)
+            guesses.append(guess)
+    return guesses
+
+
+_worker_game = None
+
+
+def _initialize_worker(agent, allowed_guesses, pool):
+    global _worker_game
+    _worker_game = (agent, allowed_guesses, pool)
+
+
+def _play_worker_game(target):
+    agent, allowed_guesses, pool = _worker_game
+    return target, play_one(agent, allowed_guesses, pool, target)
+
+
+def simulate(agent, allowed_guesses, pool, targets=None, num_workers=1, track_progress=True):
+    """Plays a game of Wordle for every target, optionally across several processes.
+
+    Parameters
+    ----------
+    agent : agent.WordleAgent
+        AI who will play Wordle
+    allowed_guesses : list[str]
+        List of allowable guesses
+    pool : list[str]
+        Pool of possible answers
+    targets : list[str], optional
+        The target words to play (the default is every word in the pool)
+    num_workers : int
+        Number of processes that play games
+    track_progress : bool
+        Whether to display a progress bar
+
+    Returns
+    -------
+    dict[str, list[str]]
+        The guesses made for each target, in the order of the targets
+    """
+
+    if targets is None:
+        targets = pool
+    if num_workers > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=num_workers, initializer=_initialize_worker,
+                                 initargs=(agent, allowed_guesses, pool)) as executor:
+            games = executor.map(_play_worker_game, targets, chunksize=8)
+            if track_progress:
+                from tqdm import tqdm
+                games = tqdm(games, total=len(targets))
+            results = dict(games)
+    else:
+        if track_progress:
+            from tqdm import tqdm
+            targets = tqdm(targets)
+        results = {target: play_one(agent, allowed_guesses, pool, target) for target in targets}
+    return results
+
+
+def summarize(results):
+    """Summarizes the games played by simulate.
+
+    Returns
+    -------
+    dict
+        The guess-count histogram (failures are not counted), mean number of guesses
+        (counting every game), number of failed games, and the guesses of every game
+    """
+
+    solved = [len(guesses) for target, guesses in results.items() if guesses[-1] == target]
+    counts = Counter(solved)
+    total = sum(len(guesses) for guesses in results.values())
+    return {"games": len(results),
+            "histogram": {str(n): counts[n] for n in range(1, MAX_GUESSES + 1)},
+            "mean_guesses": total / len(results) if len(results) > 0 else 0.0,
+            "failures": len(results) - len(solved),
+            "guesses": results}
+
+
+def write_json(summary, filename):
+    with open(filename, "w") as writer:
+        json.dump(summary, writer, indent=2)
+
+
+def write_csv(summary, filename):
+    with open(filename, "w", newline="") as writer:
+        csv_writer = csv.writer(writer)
+        csv_writer.writerow(["target", "num_guesses", "solved", "guesses"])
+        for target, guesses in summary["guesses"].items():
+            csv_writer.writerow([target, len(guesses), int(guesses[-1] == target),
+                                 " ".join(guesses)])
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description="Plays Wordle for every answer, headless.")
+    parser.add_argument("allowed_file")
+    parser.add_argument("answer_file")
+    parser.add_argument("--workers", type=int, default=1, help="number of processes")
+    parser.add_argument("--json", help="file for the summary and every game, as JSON")
+    parser.add_argument("--csv", help="file for the guesses of every game, as CSV")
+    parser.add_argument("--telemetry", help="file for per-turn timing percentiles, as JSON")
+    parser.add_argument("--book", help="opening book built by openingbook.py")
+    args = parser.parse_args(args)
+    if args.telemetry is not None and args.workers > 1:
+        parser.error("--telemetry requires a single worker")
+    recorder = TelemetryRecorder() if args.telemetry is not None else None
+    allowed, answers = Vocabulary.from_file(args.allowed_file), Vocabulary.from_file(args.answer_file)
+    book = load_book(args.book, allowed, answers) if args.book is not None else None
+    agent = WordleAgent(fast_expectation, track_progress=False, instrument=recorder, book=book)
+    results = simulate(agent, allowed, answers, num_workers=args.workers)
+    summary = summarize(results)
+    if args.json is not None:
+        write_json(summary, args.json)
+    if args.csv is not None:
+        write_csv(summary, args.csv)
+    if recorder is not None:
+        recorder.dump(args.telemetry)
+    print(f"Played {summary['games']} games: mean of {summary['mean_guesses']:.4f} guesses, "
+          f"{summary['failures']} failures.")
+    print(f"Histogram: {summary['histogram']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+import sys
+import json
+from collections import defaultdict
+from util import read_words
+from infomax import split_codes, fast_expectation
+from agent import WordleAgent
+from simulate import MAX_GUESSES
+
+
+TREE_VERSION = 1
+
+
+def feedback_codes(guess, pool, feedback=None):
+    """Computes the feedback code that each pool word would produce for a guess.
+
+    Without a feedback matrix, these are the codes of infomax.split_codes: two targets
+    share a code iff constraints.update_pool leaves them with the same pool.
+
+    Parameters
+    ----------
+    guess : str
+        The guessed word
+    pool : list[str]
+        The current pool of possible answers
+    feedback : feedback.FeedbackMatrix, optional
+        If provided, the (duplicate-aware) codes are looked up in the matrix instead
+
+    Returns
+    -------
+    list[int]
+        The feedback code for each word of the pool
+    """
+
+    if feedback is not None:
+        return [int(code) for code in feedback.patterns(guess, pool)]
+    return [int(code) for code in split_codes([guess], pool)[0]]
+
+
+def partition(guess, pool, feedback=None):
+    """Partitions a pool by the feedback code each word would produce for a guess.
+
+    Returns
+    -------
+    dict[int, list[str]]
+        Maps each feedback code to the words of the pool that produce it
+    """
+
+    partitions = defaultdict(list)
+    for word, code in zip(pool, feedback_codes(guess, pool, feedback)):
+        partitions[code].append(word)
+    return partitions
+
+
+def compile_tree(agent, allowed_guesses, pool):
+    """Records the agent's guess for every feedback history it can encounter.
+
+    Since the agent's guess depends only on the pool, and the pool depends only on the
+    feedback history, this captures the agent's entire strategy.
+
+    Parameters
+    ----------
+    agent : agent.WordleAgent
+        AI whose strategy is compiled
+    allowed_guesses : list[str]
+        List of allowable guesses
+    pool : list[str]
+        Pool of possible answers
+
+    Returns
+    -------
+    list
+        The root node of the tree. Each node is a [guess, children] pair, where children
+        maps each feedback code (other than the code of a solved game) to a child node.
+    """
+
+    def compile_node(guess, pool, num_guesses):
+        children = {}
+        if num_guesses < MAX_GUESSES:
+            for code, subpool in sorted(partition(guess, pool, agent.feedback).items()):
+                if subpool != [guess]:
+                    next_guess = agent.make_guess(allowed_guesses, subpool)
+                    children[code] = compile_node(next_guess, subpool, num_guesses + 1)
+        return [guess, children]
+    return compile_node(agent.first_guess(), pool, num_guesses=1)
+
+
+def save_tree(tree, filename):
+    with open(filename, "w") as writer:
+        json.dump({"version": TREE_VERSION, "tree": tree}, writer, separators=(",", ":"))
+
+
+def load_tree(filename):
+    """Loads a tree saved by save_tree (JSON turns its feedback codes into strings)."""
+
+    def convert(node):
+        guess, children = node
+        return [guess, {int(code): convert(child) for code, child in children.items()}]
+    with open(filename) as reader:
+        data = json.load(reader)
+    if data["version"] != TREE_VERSION:
+        raise ValueError(f"Unsupported solve tree version: {data['version']}")
+    return convert(data["tree"])
+
+
+class TreeAgent:
+    """Plays Wordle by looking up the guesses of a compiled solve tree.
+
+    Parameters
+    ----------
+    tree : list
+        The root node of a tree produced by compile_tree
+    pool : list[str]
+        The pool of possible answers the tree was compiled for
+    feedback : feedback.FeedbackMatrix, optional
+        The feedback matrix of the compiled agent, if it had one
+    fallback : agent.WordleAgent, optional
+        Agent consulted for pools that are not in the tree
+    """
+
+    def __init__(self, tree, pool, feedback=None, fallback=None):
+        self.tree = tree
+        self.feedback = feedback
+        self.fallback = fallback
+        self.pool_guesses = {}
+        self.index_pools(tree, pool)
+
+    def index_pools(self, node, pool):
+        guess, children = node
+        self.pool_guesses[frozenset(pool)] = guess
+        if len(children) > 0:
+            for code, subpool in partition(guess, pool, self.feedback).items():
+                if code in children:
+                    self.index_pools(children[code], subpool)
+
+    def first_guess(self):
+        return self.tree[0]
+
+    def guess_after(self, history):
+        """Returns the guess to make after a sequence of feedback codes."""
+
+        node = self.tree
+        for code in history:
+            node = node[1][code]
+        return node[0]
+
+    def make_guess(self, allowed_guesses, pool):
+        key = frozenset(pool)
+        if key not in self.pool_guesses and self.fallback is not None:
+            return self.fallback.make_guess(allowed_guesses, pool)
+        return self.pool_guesses[key]
+
+
+if __name__ == "__main__":
+    allowed_file = sys.argv[1]
+    answer_file = sys.argv[2]
+    tree_file = sys.argv[3]
+    agent = WordleAgent(fast_expectation, track_progress=False)
+    save_tree(compile_tree(agent, read_words(allowed_file), read_words(answer_file)), tree_file)
+    print(f"Saved the solve tree to {tree_file}.")
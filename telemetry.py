@@ -0,0 +1,90 @@
+import sys
+import json
+from collections import defaultdict
+import numpy as np
+
+
+class TelemetryRecorder:
+    """Collects the statistics reported by instrumentation hooks.
+
+    An instance can be passed as the instrument callback of agent.WordleAgent and
+    constraints.update_pool. Every numeric (or boolean) statistic of an event is kept as a
+    sample, so that its distribution can be summarized afterwards.
+
+    Parameters
+    ----------
+    keep_events : bool
+        Whether to also keep the raw (event, stats) records, in order
+    """
+
+    def __init__(self, keep_events=False):
+        self.samples = defaultdict(lambda: defaultdict(list))
+        self.counts = defaultdict(int)
+        self.keep_events = keep_events
+        self.events = []
+
+    def __call__(self, event, stats):
+        self.counts[event] += 1
+        for key, value in stats.items():
+            self.samples[event][key].append(float(value))
+        if self.keep_events:
+            self.events.append((event, dict(stats)))
+
+    def clear(self):
+        self.samples.clear()
+        self.counts.clear()
+        self.events.clear()
+
+    def percentiles(self, quantiles=(50, 90, 99)):
+        """Summarizes the samples of every statistic of every event.
+
+        Parameters
+        ----------
+        quantiles : tuple[int]
+            The percentiles to report
+
+        Returns
+        -------
+        dict[str, dict[str, dict]]
+            Maps each event and statistic to its count, total, mean, maximum and the
+            requested percentiles (keyed like "p50")
+        """
+
+        summary = {}
+        for event, stats in self.samples.items():
+            summary[event] = {}
+            for key, values in stats.items():
+                values = np.array(values)
+                summary[event][key] = {"count": len(values), "total": float(values.sum()),
+                                       "mean": float(values.mean()), "max": float(values.max())}
+                for q, value in zip(quantiles, np.percentile(values, quantiles)):
+                    summary[event][key][f"p{q}"] = float(value)
+        return summary
+
+    def dump(self, filename=None, quantiles=(50, 90, 99)):
+        """Writes the percentiles to a JSON file or, without a filename, prints a table."""
+
+        summary = self.percentiles(quantiles)
+        if filename is not None:
+            with open(filename, "w") as writer:
+                json.dump({"counts": dict(self.counts), "percentiles": summary}, writer, indent=2)
+            return
+        columns = ["mean"] + [f"p{q}" for q in quantiles] + ["max"]
+        for event, stats in summary.items():
+            print(f"{event} ({self.counts[event]} calls)")
+            print(f"  {'statistic':<16}" + "".join(f"{column:>12}" for column in columns))
+            for key, values in stats.items():
+                print(f"  {key:<16}" + "".join(f"{values[column]:>12.6g}" for column in columns))
+
+
+if __name__ == "__main__":
+    from util import read_words
+    from infomax import fast_expectation
+    from agent import WordleAgent
+    from simulate import play_one
+    allowed, answers = read_words(sys.argv[1]), read_words(sys.argv[2])
+    recorder = TelemetryRecorder()
+    agent = WordleAgent(fast_expectation, track_progress=False, instrument=recorder)
+    for target in answers[:int(sys.argv[3]) if len(sys.argv) > 3 else 100]:
+        play_one(agent, allowed, answers, target)
+    recorder.dump()
@@ -0,0 +1,60 @@
+##
+# test_adversary.py
+# Unit tests for adversary.py.
+##
+
+
+import unittest
+from infomax import expectation
+from feedback import feedback_code
+from agent import WordleAgent
+from adversary import worst_case, batch_worst_case, Adversary, play_adversary
+
+class TestAdversary(unittest.TestCase):
+
+    def test_worst_case(self):
+        pool = ["AD", "AT", "AX", "ID", "TO", "TI"]
+        # TI splits the pool into {AD, AX}, {AT}, {ID}, {TO} and solves TI.
+        self.assertAlmostEqual(worst_case("TI", pool), 2 + expectation("TI", pool) / 7)
+        self.assertAlmostEqual(worst_case("ZZ", pool), 6 + 6 / 7)
+        costs = batch_worst_case(pool, pool, chunk_size=4)
+        for guess, cost in zip(pool, costs):
+            self.assertAlmostEqual(cost, worst_case(guess, pool))
+
+    def test_update_pool(self):
+        pool = ["AD", "AT", "AX", "ID", "TO", "TI"]
+        adversary = Adversary()
+        self.assertEqual(adversary.update_pool("TI", "TO", pool), ["AD", "AX"])
+        self.assertFalse(adversary.solved)
+        self.assertEqual(adversary.update_pool("AX", None, ["AX"]), ["AX"])
+        self.assertTrue(adversary.solved)
+        adversary.reset()
+        self.assertEqual((adversary.codes, adversary.solved), ([], False))
+
+    def test_play_adversary(self):
+        pool = ["CRANE", "CRATE", "PLANE", "ANODE", "PANIC", "EERIE", "TENET"]
+        agent = WordleAgent(cost_fn=worst_case, track_progress=False)
+        adversary = Adversary(duplicate_aware=True)
+        answer, guesses = play_adversary(agent, pool, pool, adversary, first_guess="CRANE")
+        self.assertEqual(guesses[-1], answer)
+        self.assertEqual(adversary.codes, [feedback_code(guess, answer) for guess in guesses])
+        answer, guesses = play_adversary(agent, pool, pool, first_guess="EERIE", max_guesses=1)
+        self.assertIsNone(answer)
+        self.assertEqual(guesses, ["EERIE"])
+
+    def test_wordle_player(self):
+        from flow import WordlePlayer
+        pool = ["CRANE", "CRATE", "PLANE", "ANODE", "PANIC", "EERIE", "TENET"]
+        agent = WordleAgent(cost_fn=worst_case, track_progress=False)
+        agent.first_guess = lambda: "CRANE"
+        player = WordlePlayer(agent, pool, pool, adversary=Adversary())
+        for _ in range(2):
+            self.assertEqual(player.update(), len(player.most_recent_result()[1]))
+        (first, first_guesses), (second, second_guesses) = player.results
+        self.assertEqual((first, first_guesses), (second, second_guesses))
+        self.assertEqual(first_guesses[-1], first)
+        self.assertEqual(player.play_one("PANIC"), first_guesses)
+
+
+if __name__ == "__main__":
+    unittest.main()   
@@ -4,8 +4,11 @@
 ##
 
 
+import pickle
 import unittest
-from infomax import expectation
+from util import read_words
+from infomax import expectation, fast_expectation
+from feedback import FeedbackMatrix
 from agent import WordleAgent
 
 class TestAgent(unittest.TestCase):
@@ -22,6 +25,111 @@ class TestAgent(unittest.TestCase):
         self.assertAlmostEqual(costs[2], 2)
         self.assertAlmostEqual(costs[3], 7/3)
 
+    def test_score_guesses_batch(self):
+        agent = WordleAgent(cost_fn=fast_expectation)
+        pool = ["AD", "AT", "AX", "ID", "TO", "TI"]
+        scored_guesses = agent.score_guesses(["AT", "AX", "ID", "TI"], pool)
+        ranked = [guess for _, guess in scored_guesses]
+        self.assertEqual(ranked, ["TI", "AT", "ID", "AX"])
+
+    def test_score_guesses_parallel(self):
+        pool = ["AD", "AT", "AX", "ID", "TO", "TI"]
+        serial = WordleAgent(cost_fn=expectation, track_progress=False)
+        parallel = WordleAgent(cost_fn=expectation, track_progress=False,
+                               num_workers=2, chunk_size=2)
+        self.assertEqual(parallel.score_guesses(pool, pool), serial.score_guesses(pool, pool))
+        parallel.close()
+
+    def test_score_guesses_executor(self):
+        pool = ["AD", "AT", "AX", "ID", "TO", "TI"]
+        guesses = pool + ["DO", "OD", "XI"]
+        serial = WordleAgent(cost_fn=fast_expectation, track_progress=False)
+        with WordleAgent(cost_fn=fast_expectation, track_progress=False,
+                         num_workers=2, chunk_size=2) as parallel:
+            self.assertEqual(parallel.score_guesses(guesses, pool),
+                             serial.score_guesses(guesses, pool))
+            executor = parallel.executor
+            self.assertIsNotNone(executor)
+            self.assertEqual(parallel.score_guesses(guesses, pool[:4]),
+                             serial.score_guesses(guesses, pool[:4]))
+            self.assertIs(parallel.executor, executor)
+            self.assertIsNone(pickle.loads(pickle.dumps(parallel)).executor)
+        self.assertIsNone(parallel.executor)
+
+    def test_guess_cache(self):
+        agent = WordleAgent(cost_fn=expectation, track_progress=False, cache_size=2)
+        pool = ["AD", "AT", "AX", "ID", "TO", "TI"]
+        guesses = ["AT", "AX", "ID", "TI"]
+        self.assertEqual(agent.make_guess(guesses, pool), "TI")
+        self.assertEqual(agent.make_guess(guesses, list(reversed(pool))), "TI")
+        self.assertEqual(agent.make_guess(guesses, pool[:4]), agent.search_guess(guesses, pool[:4]))
+        agent.make_guess(guesses, pool[:5])
+        info = agent.cache_info()
+        self.assertEqual((info["hits"], info["misses"], info["evictions"]), (1, 3, 1))
+        self.assertEqual(info["size"], 2)
+        agent.clear_cache()
+        self.assertEqual(agent.cache_info()["size"], 0)
+
+    def test_prune_candidates(self):
+        agent = WordleAgent(cost_fn=expectation, track_progress=False, prune=True)
+        pool = ["AD", "AT", "AX", "ID", "TO", "TI"]
+        survivors = agent.prune_candidates(["ZZ", "TI", "OD", "DO", "AT"], pool)
+        self.assertEqual(survivors, ["TI", "DO", "AT"])
+        self.assertEqual(agent.last_pruned, 2)
+        unpruned = WordleAgent(cost_fn=expectation, track_progress=False, prune=False)
+        guesses = ["ZZ", "XA", "AX", "TI", "IT", "DO", "OD"]
+        self.assertEqual(agent.make_guess(guesses, pool), unpruned.make_guess(guesses, pool))
+
+    def test_prune_default(self):
+        self.assertFalse(WordleAgent(cost_fn=fast_expectation).prune)
+        matrix = FeedbackMatrix(["AT"], ["AT"])
+        self.assertTrue(WordleAgent(cost_fn=matrix.expectation).prune)
+        # The recursive expectation gives guesses that split the pool alike costs that
+        # differ in the last bit, so pruning would change its choice here
+        agent = WordleAgent(cost_fn=expectation, track_progress=False)
+        self.assertFalse(agent.prune)
+        allowed = read_words("data/allowed.txt")
+        pool = ["alloy", "siren", "sieve", "swami", "reset", "straw", "robin", "freak", "mecca"]
+        self.assertEqual(agent.make_guess(allowed, pool), "bleat")
+
+    def test_prune_matrix_codes(self):
+        # By split codes, ABASE and ABCEE split this pool alike, but not by the
+        # duplicate-aware codes that FeedbackMatrix.expectation scores.
+        pool = ["cabby", "phase", "prune", "verge", "slush", "buddy", "leapt", "scary"]
+        guesses = ["abase", "abcee", "antes"]
+        matrix = FeedbackMatrix(guesses, pool)
+        agent = WordleAgent(cost_fn=matrix.expectation, track_progress=False)
+        self.assertTrue(agent.prune)
+        # ANTES and ABCEE both tell every pool word apart
+        self.assertEqual(agent.prune_candidates(guesses, pool), ["abase", "abcee"])
+        unpruned = WordleAgent(cost_fn=matrix.expectation, track_progress=False, prune=False)
+        self.assertEqual(agent.make_guess(guesses, pool), unpruned.make_guess(guesses, pool))
+        self.assertEqual(agent.prune_candidates([], pool), [])
+
+    def test_word_pool_cost_with_feedback(self):
+        matrix = FeedbackMatrix(["AT"], ["AT"])
+        for cost_fn in [fast_expectation, expectation]:
+            with self.assertRaises(ValueError):
+                WordleAgent(cost_fn=cost_fn, feedback=matrix)
+        WordleAgent(cost_fn=matrix.expectation, feedback=matrix)
+
+    def test_answer_id_pools(self):
+        pool = ["AD", "AT", "AX", "ID", "TO", "TI"]
+        guesses = ["AT", "AX", "ID", "TI", "TO"]
+        matrix = FeedbackMatrix(guesses, pool)
+        agent = WordleAgent(cost_fn=matrix.expectation, track_progress=False, feedback=matrix)
+        ids = matrix.answer_ids(pool)
+        self.assertEqual(agent.make_guess(guesses, ids[:1]), "AD")
+        self.assertIn(agent.make_guess(guesses, ids[:3]), pool[:3])
+        for target in pool:
+            ids, guess, turns = matrix.answer_ids(pool), "TI", 1
+            while guess != target:
+                ids = matrix.update_pool(guess, target, ids)
+                guess = agent.make_guess(guesses, ids)
+                self.assertIsInstance(guess, str)
+                turns += 1
+            self.assertLessEqual(turns, 4)
+
     def test_lowest_cost_guess(self):
         agent = WordleAgent(cost_fn=expectation)
         pool = ["AD", "AT", "AX", "ID", "TO", "TI"]
@@ -0,0 +1,28 @@
+##
+# test_benchmark.py
+# Unit tests for benchmark.py.
+##
+
+
+import unittest
+from benchmark import time_function, compare
+
+class TestBenchmark(unittest.TestCase):
+
+    def test_time_function(self):
+        stats = time_function(lambda: sum(range(100)), rounds=3, min_time=0.001)
+        self.assertEqual(stats["rounds"], 3)
+        self.assertGreaterEqual(stats["calls"], 1)
+        self.assertLessEqual(stats["min"], stats["median"])
+        self.assertLessEqual(stats["median"], stats["max"])
+
+    def test_compare(self):
+        baseline = {"benchmarks": {"a": {"median": 1.0}, "b": {"median": 2.0}}}
+        results = {"benchmarks": {"a": {"median": 1.05}, "b": {"median": 3.0},
+                                  "c": {"median": 9.0}}}
+        self.assertEqual(compare(results, baseline, threshold=0.1), [("b", 2.0, 3.0, 1.5)])
+        self.assertEqual(len(compare(results, baseline, threshold=0.01)), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()   
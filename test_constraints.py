@@ -6,7 +6,8 @@
 
 import unittest
 from constraints import get_constraints, MembershipConstraint, EqualityConstraint
-from naive import reduction, expected_reduction, best_expected_reduction
+from constraints import is_permitted, update_pool, WordIndex
+from naive import reduction, expected_reduction, best_expected_reduction, sampled_reductions
 
 class TestConstraints(unittest.TestCase):
 
@@ -27,6 +28,19 @@ class TestConstraints(unittest.TestCase):
         self.assertEqual(constraint.permits("CRONY"), False)
 
 
+    def test_word_index(self):
+        pool = ["ALERT", "ALOHA", "NAIVE", "CRONY", "ANODE", "AMAZE", "EERIE", "THERE"]
+        index = WordIndex(pool)
+        for guess in pool:
+            for target in pool:
+                constraints = get_constraints(guess, target)
+                expected = [word for word in pool if is_permitted(word, constraints)]
+                self.assertEqual(update_pool(guess, target, pool, index=index), expected)
+        ids = update_pool("CRANE", "NAIVE", index.ids(pool), index=index)
+        self.assertEqual(index.to_words(ids), ["NAIVE", "ANODE"])
+        bits = update_pool("CRANE", "NAIVE", index.bitset(pool), index=index)
+        self.assertEqual(index.to_words(bits), ["NAIVE", "ANODE"])
+
     def test_reduction(self):
         pool = ["ALERT", "ALOHA", "NAIVE", "CRONY", "ANODE"]
         self.assertEqual(reduction("CRANE", "NAIVE", pool), 0.4)
@@ -53,6 +67,15 @@ class TestConstraints(unittest.TestCase):
         pool = ["ABBBB", "CDCCC", "EEFEE", "GGGHG", "BDFHG"]
         self.assertEqual(best_expected_reduction(pool, pool), "BDFHG")
 
+    def test_sampled_reductions(self):
+        pool = ["ALERT", "ALOHA", "NAIVE", "CRONY", "ANODE"]
+        means, half_widths = sampled_reductions(["CRANE"], pool, pool)
+        self.assertAlmostEqual(means[0], 0.28)
+        self.assertAlmostEqual(half_widths[0], 1.959964 * 0.1095445 / 5 ** 0.5, places=5)
+        means, half_widths = sampled_reductions(["CRANE"], ["ALERT", "ALOHA"], pool)
+        self.assertAlmostEqual(means[0], 0.2)
+        self.assertAlmostEqual(half_widths[0], 0.0)
+
 
 if __name__ == "__main__":
     unittest.main()   
\ No newline at end of file
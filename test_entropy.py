@@ -0,0 +1,43 @@
+##
+# test_entropy.py
+# Unit tests for entropy.py.
+##
+
+
+import unittest
+from math import log2
+from entropy import entropy, batch_entropy
+from agent import WordleAgent
+
+class TestEntropy(unittest.TestCase):
+
+    def test_entropy(self):
+        pool = ["AD", "AT", "AX", "ID", "TO", "TI"]
+        self.assertAlmostEqual(entropy("ZZ", pool), 0.0)
+        self.assertAlmostEqual(entropy("TI", pool), -(log2(6) - 1/3))
+        self.assertAlmostEqual(entropy("AT", ["AD", "AT", "TO", "TI"]), -1.5)
+
+    def test_batch_entropy(self):
+        pool = ["AD", "AT", "AX", "ID", "TO", "TI"]
+        partitions = {
+            "ZZ": [["AD", "AT", "AX", "ID", "TO", "TI"]],
+            "TI": [["AD", "AX"], ["AT"], ["ID"], ["TO"], ["TI"]],
+            "AT": [["AD", "AX"], ["AT"], ["ID"], ["TO", "TI"]],
+            "AX": [["AD", "AT"], ["AX"], ["ID", "TO", "TI"]],
+            "DA": [["AD"], ["AT", "AX"], ["ID"], ["TO", "TI"]],
+        }
+        guesses = list(partitions)
+        costs = batch_entropy(guesses, pool, chunk_size=2)
+        for guess, cost in zip(guesses, costs):
+            sizes = [len(part) for part in partitions[guess]]
+            expected = -(log2(len(pool)) - sum(n * log2(n) for n in sizes) / len(pool))
+            self.assertAlmostEqual(cost, expected)
+
+    def test_agent(self):
+        agent = WordleAgent(cost_fn=entropy, track_progress=False)
+        pool = ["AD", "AT", "AX", "ID", "TO", "TI"]
+        self.assertEqual(agent.lowest_cost_guess(["AT", "AX", "ID", "TI"], pool), "TI")
+
+
+if __name__ == "__main__":
+    unittest.main()   
@@ -4,7 +4,7 @@
 ##
 
 import unittest
-from expectimax import max_layer
+from expectimax import max_layer, ExpectimaxSolver
 
 class TestInfomax(unittest.TestCase):
 
@@ -12,6 +12,28 @@ class TestInfomax(unittest.TestCase):
         pool = ["AD", "AT", "AX", "ID", "TO", "TI"]
         print(max_layer(pool, pool))
 
+    def test_max_layer(self):
+        pool = ["AD", "AT", "AX", "ID", "TO", "TI"]
+        guess, value = max_layer(pool, pool)
+        self.assertEqual(guess, "TI")
+        self.assertAlmostEqual(value, 2.0)
+        pool = ["CRANE", "CRATE", "PLANE", "ANODE", "PANIC", "TENET", "ABBEY"]
+        guess, value = max_layer(pool, pool)
+        self.assertAlmostEqual(value, 13/7)
+
+    def test_solver(self):
+        pool = ["AD", "AT", "AX", "ID", "TO", "TI"]
+        solver = ExpectimaxSolver(pool, pool, max_guesses=2)
+        self.assertEqual(solver.solve(), (None, float('inf')))
+        solver = ExpectimaxSolver(pool, pool, max_guesses=3)
+        self.assertAlmostEqual(solver.solve()[1], 2.0)
+        self.assertAlmostEqual(solver.solve(["AD", "AT"])[1], 1.5)
+
+    def test_solver_without_splits(self):
+        # Every allowed guess gets all-gray feedback, so the pool cannot be solved
+        solver = ExpectimaxSolver(["ZZ", "XY"], ["AD", "AT", "TO"])
+        self.assertEqual(solver.solve(), (None, float('inf')))
+
 
 if __name__ == "__main__":
     unittest.main()   
\ No newline at end of file
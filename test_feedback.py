@@ -0,0 +1,94 @@
+##
+# test_feedback.py
+# Unit tests for feedback.py.
+##
+
+
+import os
+import pickle
+import tempfile
+import unittest
+import numpy as np
+from feedback import feedback_code, decode_feedback, encode_feedback, FeedbackMatrix
+from infomax import encode_words
+from util import read_words
+from constraints import update_pool, get_constraint_colors
+from agent import WordleAgent
+
+class TestFeedback(unittest.TestCase):
+
+    def test_feedback_code(self):
+        self.assertEqual(feedback_code("CRANE", "CRANE"), 242)
+        self.assertEqual(feedback_code("CRANE", "BUILT"), 0)
+        self.assertEqual(decode_feedback(feedback_code("CRANE", "NAIVE")),
+                         get_constraint_colors("CRANE", "NAIVE"))
+        self.assertEqual(decode_feedback(feedback_code("EERIE", "THERE")),
+                         ["yellow", "gray", "yellow", "gray", "green"])
+
+    def test_encode_feedback(self):
+        words = ["EERIE", "THERE", "ABBEY", "BABES", "EVERY", "ERASE", "SPEED", "LLAMA"]
+        codes = encode_feedback(encode_words(words), encode_words(words))
+        for i, guess in enumerate(words):
+            for j, answer in enumerate(words):
+                self.assertEqual(codes[i, j], feedback_code(guess, answer))
+
+    def test_encode_feedback_answers(self):
+        answers = read_words("data/answers.txt")
+        codes = FeedbackMatrix.build_codes(answers, answers)
+        for i, guess in enumerate(answers):
+            expected = [feedback_code(guess, answer) for answer in answers]
+            self.assertEqual(codes[i].tolist(), expected, guess)
+
+    def test_long_words(self):
+        words = ["BATTER", "TREATY", "BETTER", "RABBIT", "STREET", "TATTER"]
+        matrix = FeedbackMatrix(words, words)
+        self.assertEqual(matrix.codes.dtype, np.uint16)
+        for i, guess in enumerate(words):
+            expected = [feedback_code(guess, answer) for answer in words]
+            self.assertEqual(matrix.codes[i].tolist(), expected, guess)
+            self.assertEqual(matrix.partition_sizes(guess, words).sum(), len(words))
+        self.assertEqual(matrix.codes[0, 0], 3 ** 6 - 1)
+
+    def test_matrix(self):
+        pool = ["ALERT", "ALOHA", "NAIVE", "CRONY", "ANODE"]
+        matrix = FeedbackMatrix(pool, pool)
+        for guess in pool:
+            for answer in pool:
+                self.assertEqual(matrix.patterns(guess, [answer])[0],
+                                 feedback_code(guess, answer))
+
+    def test_update_pool(self):
+        pool = ["AD", "AT", "AX", "ID", "TO", "TI"]
+        matrix = FeedbackMatrix(pool + ["DE"], pool)
+        updated_pool = update_pool(guess="TO", target="AX", pool=pool, feedback=matrix)
+        self.assertEqual(set(updated_pool), set(["AD", "AX", "ID"]))
+        updated_pool = update_pool(guess="DE", target="AD", pool=pool, feedback=matrix)
+        self.assertEqual(set(updated_pool), set(["AD", "ID"]))
+        ids = matrix.update_pool("DE", "AD", matrix.answer_ids(pool))
+        self.assertEqual(set(matrix.words(ids)), set(["AD", "ID"]))
+
+    def test_cache(self):
+        pool = ["AD", "AT", "AX", "ID", "TO", "TI"]
+        with tempfile.TemporaryDirectory() as cache_dir:
+            built = FeedbackMatrix.load(pool, pool, cache_dir=cache_dir)
+            cached = FeedbackMatrix.load(pool, pool, cache_dir=cache_dir)
+            self.assertIsInstance(cached.codes, np.memmap)
+            self.assertTrue((built.codes == cached.codes).all())
+            FeedbackMatrix.load(pool, pool[:-1], cache_dir=cache_dir)
+            self.assertEqual(len(os.listdir(cache_dir)), 2)
+            unpickled = pickle.loads(pickle.dumps(cached))
+            self.assertIsInstance(unpickled.codes, np.memmap)
+            self.assertTrue((built.codes == unpickled.codes).all())
+
+    def test_score_guesses(self):
+        pool = ["AD", "AT", "AX", "ID", "TO", "TI"]
+        matrix = FeedbackMatrix(pool, pool)
+        agent = WordleAgent(cost_fn=matrix.expectation, feedback=matrix)
+        scored_guesses = agent.score_guesses(["AT", "AX", "ID", "TI"], pool)
+        ranked = [guess for _, guess in scored_guesses]
+        self.assertEqual(ranked, ["TI", "AT", "ID", "AX"])
+        self.assertAlmostEqual(scored_guesses[0][0], 4/3)
+
+
+if __name__ == "__main__":
+    unittest.main()   
@@ -0,0 +1,42 @@
+##
+# test_flow.py
+# Unit tests for flow.py.
+##
+
+
+import time
+import unittest
+from infomax import expectation
+from agent import WordleAgent
+from flow import WordlePlayer
+
+class TestFlow(unittest.TestCase):
+
+    def setUp(self):
+        self.pool = ["AD", "AT", "AX", "ID", "TO", "TI"]
+        self.agent = WordleAgent(cost_fn=expectation, track_progress=False)
+        self.agent.first_guess = lambda: "TI"
+
+    def test_refill(self):
+        player = WordlePlayer(self.agent, self.pool, self.pool)
+        for _ in range(len(self.pool) + 2):
+            self.assertIsNotNone(player.update())
+        targets = [target for target, _ in player.results]
+        self.assertEqual(sorted(targets[:len(self.pool)]), sorted(self.pool))
+
+    def test_restart_producer(self):
+        player = WordlePlayer(self.agent, self.pool, self.pool)
+        player.start()
+        first = player.producer
+        deadline = time.time() + 30
+        while len(player.results) <= len(self.pool) and time.time() < deadline:
+            player.update()
+            time.sleep(0.01)
+        player.stop()
+        self.assertGreater(len(player.results), len(self.pool))
+        self.assertIsNot(player.producer, first)
+        self.assertFalse(first.is_alive())
+
+
+if __name__ == "__main__":
+    unittest.main()   
@@ -0,0 +1,73 @@
+##
+# test_gamestate.py
+# Unit tests for gamestate.py.
+##
+
+
+import unittest
+from gamestate import GameState
+from constraints import update_pool
+from infomax import expectation
+from agent import WordleAgent
+
+class TestGameState(unittest.TestCase):
+
+    def test_apply_target(self):
+        pool = ["AD", "AT", "AX", "ID", "TO", "TI"]
+        state = GameState(pool)
+        state.apply_target("AX", "TO")
+        self.assertEqual(list(state.pool), update_pool("AX", "TO", pool))
+        self.assertEqual(state.history, [("AX", 0)])
+        state.apply_target("TI", "TO")
+        self.assertEqual(list(state.pool), ["TO"])
+
+    def test_letter_counts(self):
+        state = GameState(["AD", "AT", "AX", "ID", "TO", "TI"])
+        self.assertEqual(state.letter_counts[0, ord("A")], 3)
+        self.assertEqual(state.letter_counts[1, ord("D")], 2)
+        state.apply_target("XD", "ID")
+        self.assertEqual(list(state.pool), ["AD", "ID"])
+        self.assertEqual(state.letter_counts[0, ord("A")], 1)
+        self.assertEqual(state.letter_counts[1, ord("D")], 2)
+        self.assertEqual(state.letter_counts.sum(), 4)
+        self.assertEqual(state.splitting_guesses(["XX", "ZI", "QQ"]), ["ZI"])
+        self.assertEqual(state.splitting_guesses(["XX", "QQ"]), ["XX", "QQ"])
+
+    def test_partition(self):
+        state = GameState(["AD", "AT", "AX", "ID", "TO", "TI"])
+        partition = state.partition_by("AT")
+        self.assertEqual(sorted(len(part) for part in partition.values()), [1, 1, 2, 2])
+        self.assertIs(state.partition_by("AT"), partition)
+        state.apply_target("XD", "ID")
+        self.assertEqual(list(state.pool), ["AD", "ID"])
+        self.assertIsNone(state.partition)
+
+    def test_make_guess(self):
+        pool = ["AD", "AT", "AX", "ID", "TO", "TI"]
+        state = GameState(pool)
+        agent = WordleAgent(cost_fn=expectation, track_progress=False)
+        guesses = ["AT", "TI", "XX"]
+        guess = state.make_guess(agent, guesses)
+        self.assertEqual(guess, agent.make_guess(guesses, pool))
+        self.assertEqual(state.partition_guess, guess)
+        ranking = state.ranking(agent, guesses)
+        self.assertEqual(ranking[0][1], guess)
+        self.assertIs(state.ranking(agent, guesses), ranking)
+        self.assertEqual(state.make_guess(agent, guesses), guess)
+        state.apply_target(guess, "AD")
+        self.assertIsNone(state.ranked)
+        self.assertEqual(state.make_guess(agent, guesses), agent.make_guess(guesses, state.pool))
+
+    def test_make_guess_pruned(self):
+        pool = ["AD", "AT", "AX", "ID", "TO", "TI"]
+        guesses = ["ZZ", "XA", "AX", "TI", "IT", "DO", "OD", "QQ"]
+        agent = WordleAgent(cost_fn=expectation, track_progress=False, prune=True)
+        state = GameState(pool)
+        self.assertEqual(state.make_guess(agent, guesses), agent.make_guess(guesses, pool))
+        ranked = [guess for _, guess in state.ranking(agent, guesses)]
+        self.assertNotIn("ZZ", ranked)
+        self.assertNotIn("QQ", ranked)
+
+
+if __name__ == "__main__":
+    unittest.main()   
@@ -5,8 +5,9 @@
 
 
 import unittest
-from infomax import split_pool, expectation
-from play import update_pool
+from infomax import (split_pool, expectation, batch_expectation, fast_expectation, split_codes,
+                     partition_labels)
+from constraints import update_pool
 
 class TestInfomax(unittest.TestCase):
 
@@ -22,6 +23,22 @@ class TestInfomax(unittest.TestCase):
         self.assertAlmostEqual(expectation("TI", pool), 4/3)
         self.assertAlmostEqual(expectation("TO", pool), 2)
 
+    def test_batch_expectation(self):
+        pool = ["CRANE", "CRATE", "PLANE", "ANODE", "PANIC", "EERIE", "TENET"]
+        guesses = pool + ["NINNY", "ABBEY"]
+        costs = batch_expectation(guesses, pool, chunk_size=4)
+        for guess, cost in zip(guesses, costs):
+            self.assertAlmostEqual(cost, expectation(guess, pool))
+        self.assertAlmostEqual(fast_expectation("TI", ["AD", "AT", "AX", "ID", "TO", "TI"]), 4/3)
+
+    def test_partition_labels(self):
+        pool = ["PLANET", "PLATES", "STREAM", "MASTER", "PLANES"]
+        guesses = ["PLANET", "TENALP", "ZZZZZZ", "MASTER"]
+        labels = partition_labels(split_codes(guesses, pool), solved_code=3 ** 6 - 1)
+        self.assertEqual(labels.shape, (4, 5))
+        self.assertEqual(labels[0, 0], 5)
+        self.assertEqual(labels[2].tolist(), [0] * 5)
+        self.assertEqual(labels[3, 3], 5)
 
     def test_update_pool(self):
         pool = ["AD", "AT", "AX", "ID", "TO", "TI"]
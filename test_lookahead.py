@@ -0,0 +1,54 @@
+##
+# test_lookahead.py
+# Unit tests for lookahead.py.
+##
+
+
+import unittest
+from util import read_words
+from infomax import expectation, fast_expectation
+from agent import WordleAgent
+from lookahead import LookaheadAgent
+
+class TestLookahead(unittest.TestCase):
+
+    def test_part_value(self):
+        agent = LookaheadAgent(cost_fn=expectation, track_progress=False)
+        guesses = ["AD", "AT", "AX", "ID", "TO", "TI"]
+        self.assertEqual(agent.part_value(guesses, ["TO"], None), 1.0)
+        self.assertEqual(agent.part_value(guesses, ["AD", "ID"], None), 1.5)
+        # Guessing AT solves one game, and leaves AD and AX (1.5 guesses) otherwise.
+        self.assertAlmostEqual(agent.part_value(guesses, ["AD", "AT", "AX"], None), 2.0)
+        self.assertEqual(agent.nodes, 1)
+        agent.part_value(guesses, ["AD", "AT", "AX"], None)
+        self.assertEqual(agent.part_hits, 1)
+
+    def test_part_cache_size(self):
+        agent = LookaheadAgent(cost_fn=expectation, track_progress=False, part_cache_size=2)
+        guesses = ["AD", "AT", "AX", "ID", "TO", "TI"]
+        parts = [["AD", "AT", "AX"], ["AD", "ID", "TI"], ["AT", "TO", "TI"]]
+        for part in parts:
+            agent.part_value(guesses, part, None)
+        self.assertEqual(len(agent.part_values), 2)
+        # The oldest partition was evicted, so it is evaluated again.
+        agent.part_value(guesses, parts[0], None)
+        self.assertEqual((agent.nodes, agent.part_hits), (4, 0))
+        agent.part_value(guesses, parts[2], None)
+        self.assertEqual((agent.nodes, agent.part_hits), (4, 1))
+
+    def test_budget(self):
+        allowed = read_words("data/allowed.txt")
+        pool = read_words("data/answers.txt")[:200]
+        greedy = WordleAgent(cost_fn=fast_expectation, track_progress=False)
+        agent = LookaheadAgent(cost_fn=fast_expectation, track_progress=False, node_budget=0)
+        self.assertEqual(agent.make_guess(allowed, pool), greedy.make_guess(allowed, pool))
+        self.assertTrue(agent.budget_exhausted)
+        self.assertEqual(agent.last_evaluated, 0)
+        agent = LookaheadAgent(cost_fn=fast_expectation, track_progress=False, top_k=3)
+        agent.make_guess(allowed, pool)
+        self.assertFalse(agent.budget_exhausted)
+        self.assertEqual(agent.last_evaluated, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()   
@@ -0,0 +1,91 @@
+##
+# test_openingbook.py
+# Unit tests for openingbook.py.
+##
+
+
+import os
+import tempfile
+import unittest
+from constraints import update_pool
+from infomax import expectation
+from agent import WordleAgent
+from simulate import play_one
+from telemetry import TelemetryRecorder
+from feedback import FeedbackMatrix
+from openingbook import build_book, save_book, load_book
+
+class TestOpeningBook(unittest.TestCase):
+
+    def setUp(self):
+        self.guesses = ["AD", "AT", "AX", "ID", "TO", "TI", "XD"]
+        self.pool = ["AD", "AT", "AX", "ID", "TO", "TI"]
+        self.agent = WordleAgent(cost_fn=expectation, track_progress=False)
+
+    def test_build_book(self):
+        book = build_book(self.agent, self.guesses, self.pool, opener="AD")
+        self.assertEqual(book.opener, "AD")
+        for target in self.pool:
+            pool = update_pool("AD", target, self.pool)
+            self.assertEqual(book.reply(pool), self.agent.make_guess(self.guesses, pool))
+        self.assertIsNone(book.reply(["AT"]))
+
+    def test_reply_checks_partition(self):
+        book = build_book(self.agent, self.guesses, self.pool, opener="TI")
+        self.assertEqual(book.reply(["AX", "AD"]), book.reply_to(0))
+        # After XD instead of TI, {AD, ID} shares the code and size of TI's {AD, AX}.
+        pool = update_pool("XD", "ID", self.pool)
+        self.assertEqual(pool, ["AD", "ID"])
+        self.assertIsNone(book.reply(pool))
+
+    def test_reply_to_ids(self):
+        matrix = FeedbackMatrix(self.guesses, self.pool)
+        agent = WordleAgent(cost_fn=matrix.expectation, track_progress=False, feedback=matrix)
+        book = build_book(agent, self.guesses, self.pool)
+        for target in self.pool:
+            ids = matrix.update_pool(book.opener, target, matrix.answer_ids(self.pool))
+            self.assertIsNotNone(book.reply(ids, matrix.answers))
+            self.assertEqual(book.reply(ids, matrix.answers), book.reply(matrix.words(ids)))
+        with self.assertRaises(ValueError):
+            book.reply(ids)
+
+    def test_save_and_load(self):
+        book = build_book(self.agent, self.guesses, self.pool)
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "book.json")
+            save_book(book, filename)
+            loaded = load_book(filename, self.guesses, self.pool)
+            with self.assertRaises(ValueError):
+                load_book(filename, self.guesses, self.pool[1:])
+        self.assertEqual(loaded.opener, book.opener)
+        self.assertEqual(loaded.replies, book.replies)
+        self.assertEqual(loaded.partitions, book.partitions)
+
+    def test_agent_with_book(self):
+        book = build_book(self.agent, self.guesses, self.pool)
+        agent = WordleAgent(cost_fn=expectation, track_progress=False, book=book)
+        self.assertEqual(agent.first_guess(), book.opener)
+        for target in self.pool:
+            guesses = play_one(agent, self.guesses, self.pool, target)
+            self.assertEqual(guesses[-1], target)
+            if len(guesses) > 1:
+                pool = update_pool(book.opener, target, self.pool)
+                self.assertEqual(guesses[1], book.reply(pool))
+
+    def test_book_telemetry(self):
+        book = build_book(self.agent, self.guesses, self.pool)
+        recorder = TelemetryRecorder(keep_events=True)
+        agent = WordleAgent(cost_fn=expectation, track_progress=False, book=book,
+                            instrument=recorder)
+        guesses = play_one(agent, self.guesses, self.pool, "AX")
+        turns = [stats for event, stats in recorder.events if event == "make_guess"]
+        self.assertEqual(len(turns), len(guesses) - 1)
+        self.assertGreater(len(turns), 1)
+        self.assertTrue(turns[0]["book_hit"])
+        self.assertEqual(turns[0]["scored"], 0)
+        self.assertIn("seconds", turns[0])
+        self.assertTrue(all(not stats["book_hit"] for stats in turns[1:]))
+
+
+if __name__ == "__main__":
+    unittest.main()   
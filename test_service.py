@@ -0,0 +1,53 @@
+##
+# test_service.py
+# Unit tests for service.py.
+##
+
+
+import asyncio
+import unittest
+from util import Vocabulary
+from infomax import expectation
+from feedback import feedback_code
+from agent import WordleAgent
+from service import GameSession, GuessService, parse_feedback
+
+WORDS = ["raise", "arise", "crane", "trace", "slate", "stale", "clout", "mount", "blimp"]
+
+class TestService(unittest.TestCase):
+
+    def test_parse_feedback(self):
+        self.assertEqual(parse_feedback(7), 7)
+        self.assertEqual(parse_feedback(["green", "yellow", "gray", "gray", "gray"]), 5)
+
+    def test_apply_feedback(self):
+        session = GameSession(Vocabulary(WORDS), "raise")
+        session.apply_feedback("raise", feedback_code("raise", "stale"))
+        self.assertEqual(list(session.pool), ["slate", "stale"])
+        self.assertFalse(session.solved)
+        session.apply_feedback("stale", feedback_code("stale", "stale"))
+        self.assertEqual(list(session.pool), ["stale"])
+        self.assertTrue(session.solved)
+
+    def test_coalescing(self):
+        async def play():
+            service = GuessService(WordleAgent(expectation, track_progress=False), WORDS,
+                                   Vocabulary(WORDS))
+            try:
+                sessions = [await service.handle({"op": "new"}) for _ in range(3)]
+                code = feedback_code("raise", "clout")
+                replies = await asyncio.gather(*[
+                    service.handle({"op": "feedback", "session": reply["session"],
+                                    "feedback": code}) for reply in sessions])
+                stats = await service.handle({"op": "stats"})
+            finally:
+                service.close()
+            return replies, stats
+        replies, stats = asyncio.run(play())
+        self.assertEqual(len({reply["guess"] for reply in replies}), 1)
+        self.assertEqual(replies[0]["pool_size"], 2)
+        self.assertEqual((stats["computed"], stats["coalesced"]), (1, 2))
+
+
+if __name__ == "__main__":
+    unittest.main()   
@@ -0,0 +1,37 @@
+##
+# test_simulate.py
+# Unit tests for simulate.py.
+##
+
+
+import unittest
+from infomax import expectation
+from agent import WordleAgent
+from simulate import play_one, simulate, summarize
+
+class TestSimulate(unittest.TestCase):
+
+    def test_play_one(self):
+        agent = WordleAgent(cost_fn=expectation, track_progress=False)
+        pool = ["raise", "crane", "plane", "abbey", "tenet"]
+        self.assertEqual(play_one(agent, pool, pool, "raise"), ["raise"])
+        guesses = play_one(agent, pool, pool, "tenet")
+        self.assertEqual(guesses[0], "raise")
+        self.assertEqual(guesses[-1], "tenet")
+
+    def test_summarize(self):
+        agent = WordleAgent(cost_fn=expectation, track_progress=False)
+        pool = ["raise", "crane", "plane", "abbey", "tenet"]
+        results = simulate(agent, pool, pool, track_progress=False)
+        self.assertEqual(list(results), pool)
+        summary = summarize(results)
+        self.assertEqual(summary["games"], 5)
+        self.assertEqual(summary["failures"], 0)
+        self.assertEqual(summary["histogram"]["1"], 1)
+        self.assertEqual(sum(summary["histogram"].values()), 5)
+        self.assertAlmostEqual(summary["mean_guesses"],
+                               sum(len(guesses) for guesses in results.values()) / 5)
+
+
+if __name__ == "__main__":
+    unittest.main()   
@@ -0,0 +1,40 @@
+##
+# test_solvetree.py
+# Unit tests for solvetree.py.
+##
+
+
+import os
+import tempfile
+import unittest
+from infomax import expectation
+from agent import WordleAgent
+from simulate import simulate
+from solvetree import partition, compile_tree, save_tree, load_tree, TreeAgent
+
+class TestSolveTree(unittest.TestCase):
+
+    def test_partition(self):
+        pool = ["CRANE", "CRATE", "PLANE", "ANODE", "PANIC"]
+        partitions = partition("PLANE", pool)
+        self.assertEqual(sorted(partitions.values()),
+                         [["ANODE"], ["CRANE"], ["CRATE"], ["PANIC"], ["PLANE"]])
+
+    def test_tree_agent(self):
+        agent = WordleAgent(cost_fn=expectation, track_progress=False)
+        pool = ["raise", "crane", "plane", "abbey", "tenet", "arise", "crate", "plate"]
+        tree = compile_tree(agent, pool, pool)
+        self.assertEqual(tree[0], "raise")
+        with tempfile.TemporaryDirectory() as tree_dir:
+            save_tree(tree, os.path.join(tree_dir, "tree.json"))
+            loaded = load_tree(os.path.join(tree_dir, "tree.json"))
+        self.assertEqual(loaded, tree)
+        tree_agent = TreeAgent(loaded, pool)
+        self.assertEqual(simulate(tree_agent, pool, pool, track_progress=False),
+                         simulate(agent, pool, pool, track_progress=False))
+        code, child = next(iter(loaded[1].items()))
+        self.assertEqual(tree_agent.guess_after([code]), child[0])
+
+
+if __name__ == "__main__":
+    unittest.main()   
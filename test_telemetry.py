@@ -0,0 +1,53 @@
+##
+# test_telemetry.py
+# Unit tests for telemetry.py.
+##
+
+
+import unittest
+from telemetry import TelemetryRecorder
+from constraints import update_pool
+from infomax import expectation
+from agent import WordleAgent
+
+class TestTelemetry(unittest.TestCase):
+
+    def test_percentiles(self):
+        recorder = TelemetryRecorder()
+        for i in range(1, 101):
+            recorder("turn", {"seconds": i, "cache_hit": i % 2 == 0})
+        summary = recorder.percentiles((50, 99))
+        self.assertEqual(recorder.counts["turn"], 100)
+        self.assertEqual(summary["turn"]["seconds"]["count"], 100)
+        self.assertAlmostEqual(summary["turn"]["seconds"]["p50"], 50.5)
+        self.assertAlmostEqual(summary["turn"]["seconds"]["max"], 100.0)
+        self.assertAlmostEqual(summary["turn"]["cache_hit"]["mean"], 0.5)
+
+    def test_update_pool(self):
+        recorder = TelemetryRecorder(keep_events=True)
+        pool = ["ABC", "ABD", "XYZ"]
+        self.assertEqual(update_pool("ABC", "ABD", pool, instrument=recorder), ["ABD"])
+        event, stats = recorder.events[0]
+        self.assertEqual(event, "update_pool")
+        self.assertEqual((stats["pool_before"], stats["pool_after"]), (3, 1))
+
+    def test_agent_turns(self):
+        recorder = TelemetryRecorder(keep_events=True)
+        agent = WordleAgent(cost_fn=expectation, track_progress=False, prune=True,
+                            instrument=recorder)
+        guesses = ["ZZ", "TI", "OD", "DO", "AT"]
+        pool = ["TO", "DO", "AT", "ID"]
+        guess = agent.make_guess(guesses, pool)
+        self.assertEqual(guess, agent.make_guess(guesses, pool))
+        (_, first), (_, second) = recorder.events
+        self.assertEqual((first["pool_size"], first["candidates"]), (4, 5))
+        self.assertEqual(first["pruned"], agent.last_pruned)
+        self.assertEqual(first["scored"], 5 - agent.last_pruned)
+        self.assertFalse(first["cache_hit"])
+        self.assertTrue(second["cache_hit"])
+        self.assertEqual(second["scored"], 0)
+        self.assertIsNone(agent.turn)
+
+
+if __name__ == "__main__":
+    unittest.main()   
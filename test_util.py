@@ -0,0 +1,43 @@
+##
+# test_util.py
+# Unit tests for util.py.
+##
+
+
+import unittest
+from util import Vocabulary, PoolView
+from constraints import update_pool
+from infomax import batch_expectation, expectation
+
+class TestUtil(unittest.TestCase):
+
+    def test_vocabulary(self):
+        vocabulary = Vocabulary(["AD\n", "AT\n", "AX\n", "\n", "ID", "TO", "TI"])
+        self.assertEqual(len(vocabulary), 6)
+        self.assertEqual(list(vocabulary), ["AD", "AT", "AX", "ID", "TO", "TI"])
+        self.assertEqual(vocabulary.letters.shape, (6, 2))
+        self.assertEqual(list(vocabulary.ids(["TO", "AD"])), [4, 0])
+        self.assertIn("ID", vocabulary)
+        self.assertNotIn("IT", vocabulary)
+        with self.assertRaises(ValueError):
+            Vocabulary(["AD", "ATE"])
+        with self.assertRaises(ValueError):
+            Vocabulary(["AD", "A1"])
+
+    def test_pool_view(self):
+        vocabulary = Vocabulary(["AD", "AT", "AX", "ID", "TO", "TI"])
+        pool = vocabulary.pool()
+        updated_pool = update_pool(guess="TO", target="AX", pool=pool)
+        self.assertIsInstance(updated_pool, PoolView)
+        self.assertIs(updated_pool.vocabulary, vocabulary)
+        self.assertEqual(list(updated_pool), ["AD", "AX", "ID"])
+        self.assertEqual(list(updated_pool[1:]), ["AX", "ID"])
+        self.assertIn("AX", updated_pool)
+        self.assertNotIn("TO", updated_pool)
+        costs = batch_expectation(vocabulary, updated_pool)
+        for guess, cost in zip(vocabulary, costs):
+            self.assertAlmostEqual(cost, expectation(guess, list(updated_pool)))
+
+
+if __name__ == "__main__":
+    unittest.main()   
@@ -0,0 +1,60 @@
+##
+# test_wordle.py
+# Unit tests for wordle.py.
+##
+
+
+import io
+import os
+import sys
+import tempfile
+import subprocess
+import unittest
+from contextlib import redirect_stdout, redirect_stderr
+from infomax import split_codes
+from feedback import feedback_code, decode_feedback
+from openingbook import OpeningBook, save_book, colors_code
+from wordle import main
+
+class TestWordle(unittest.TestCase):
+
+    def test_colors_code(self):
+        for guess, target in [("speed", "abide"), ("eerie", "there"), ("raise", "cigar"),
+                              ("llama", "hello"), ("crane", "crane")]:
+            colors = "".join({"green": "g", "yellow": "y", "gray": "."}[color]
+                             for color in decode_feedback(feedback_code(guess, target)))
+            self.assertEqual(colors_code(guess, colors, duplicate_aware=True),
+                             feedback_code(guess, target))
+            self.assertEqual(colors_code(guess, colors), split_codes([guess], [target])[0, 0])
+
+    def test_best_guess(self):
+        with tempfile.TemporaryDirectory() as directory:
+            book_file = os.path.join(directory, "book.json")
+            code = colors_code("raise", "yg...")
+            save_book(OpeningBook("raise", {code: ("cigar", 2)}), book_file)
+            output = io.StringIO()
+            with redirect_stdout(output):
+                main(["best-guess", "data/allowed.txt", "data/answers.txt", "--book", book_file])
+                main(["best-guess", "data/allowed.txt", "data/answers.txt", "--book", book_file,
+                      "--feedback", "raise", "yg..."])
+        self.assertEqual(output.getvalue().split(), ["raise", "cigar"])
+
+    def test_bad_feedback(self):
+        for feedback in [["raise", "y....", "colon", ".gg.."], ["rais", "y...."],
+                         ["raise", "y..."]]:
+            args = ["best-guess", "data/allowed.txt", "data/answers.txt"]
+            for i in range(0, len(feedback), 2):
+                args += ["--feedback"] + feedback[i:i + 2]
+            with redirect_stderr(io.StringIO()), self.assertRaises(SystemExit) as context:
+                main(args)
+            self.assertEqual(context.exception.code, 2)
+
+    def test_lazy_imports(self):
+        # Answering from the opening book must not load NumPy.
+        script = "import sys, wordle, openingbook; print('numpy' in sys.modules)"
+        result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True)
+        self.assertEqual(result.stdout.strip(), "False")
+
+
+if __name__ == "__main__":
+    unittest.main()   
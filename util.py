@@ -1,6 +1,120 @@
+import sys
+import numpy as np
+
+
 def read_words(filename):
     """Reads a list of words from a file."""
 
     with open(filename) as reader:
         words = [line.strip() for line in reader]
     return words
+
+
+class Vocabulary:
+    """An immutable word list, stored as a fixed-width array of letter bytes.
+
+    Words are interned strings with integer ids (their positions in the list), so pools
+    of words can be represented as arrays of ids (see PoolView) instead of list copies.
+    A Vocabulary can be used wherever a list of words is expected.
+
+    Parameters
+    ----------
+    words : iterable[str]
+        The words, which must all have the same length and contain only ASCII letters
+    length : int, optional
+        The required word length (by default, the length of the first word)
+    """
+
+    def __init__(self, words, length=None):
+        self.length = length
+        self.words = []
+        data = bytearray()
+        for line_number, word in enumerate(words, start=1):
+            word = word.strip()
+            if len(word) == 0:
+                continue
+            if self.length is None:
+                self.length = len(word)
+            if len(word) != self.length:
+                raise ValueError(f"Word {line_number} ({word!r}) does not have {self.length} letters")
+            if not (word.isascii() and word.isalpha()):
+                raise ValueError(f"Word {line_number} ({word!r}) is not alphabetic")
+            self.words.append(sys.intern(word))
+            data.extend(word.encode("ascii"))
+        self.length = self.length or 0
+        self.letters = np.frombuffer(bytes(data), dtype=np.uint8).reshape(len(self.words),
+                                                                         self.length)
+        self.word_ids = {word: i for i, word in enumerate(self.words)}
+
+    @classmethod
+    def from_file(cls, filename, length=None):
+        """Streams a word list from a file (one word per line)."""
+
+        with open(filename) as reader:
+            return cls(reader, length=length)
+
+    def __len__(self):
+        return len(self.words)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.pool(np.arange(len(self.words))[index])
+        return self.words[index]
+
+    def __iter__(self):
+        return iter(self.words)
+
+    def __contains__(self, word):
+        return word in self.word_ids
+
+    def ids(self, words):
+        """Returns the array of ids of a collection of words."""
+
+        return np.array([self.word_ids[word] for word in words], dtype=np.intp)
+
+    def pool(self, ids=None):
+        """Returns a view of the words with the given ids (by default, all of them)."""
+
+        if ids is None:
+            ids = np.arange(len(self.words))
+        return PoolView(self, ids)
+
+
+class PoolView:
+    """A read-only sequence of words from a Vocabulary, represented by an array of word ids.
+
+    Slicing and subsetting a view produce new views that share the vocabulary, so no word
+    lists are copied.
+    """
+
+    def __init__(self, vocabulary, ids):
+        self.vocabulary = vocabulary
+        self.ids = np.asarray(ids, dtype=np.intp)
+
+    @property
+    def letters(self):
+        return self.vocabulary.letters[self.ids]
+
+    def subset(self, mask):
+        """Returns the view of the words for which a boolean mask is True."""
+
+        return PoolView(self.vocabulary, self.ids[np.asarray(mask, dtype=bool)])
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return PoolView(self.vocabulary, self.ids[index])
+        return self.vocabulary.words[self.ids[index]]
+
+    def __iter__(self):
+        words = self.vocabulary.words
+        return (words[i] for i in self.ids)
+
+    def __contains__(self, word):
+        word_id = self.vocabulary.word_ids.get(word)
+        return word_id is not None and bool((self.ids == word_id).any())
+
+    def __eq__(self, other):
+        return list(self) == list(other)
@@ -0,0 +1,95 @@
+import sys
+import argparse
+
+
+# Every subcommand imports what it needs when it runs: NumPy alone takes longer to import
+# than the whole startup budget of a query that the opening book can answer.
+
+
+def check_feedback(feedback, length):
+    for guess, colors in feedback:
+        if len(guess) != length or len(colors) != length:
+            raise ValueError(f"--feedback {guess} {colors}: expected a {length}-letter guess "
+                             f"and {length} colors")
+
+
+def best_guess(args):
+    from openingbook import load_book, colors_code
+    feedback = args.feedback or []
+    if args.book is not None:
+        book = load_book(args.book)
+        check_feedback(feedback, len(book.opener))
+        if len(feedback) == 0:
+            return book.opener
+        if len(feedback) == 1 and feedback[0][0] == book.opener:
+            reply = book.reply_to(colors_code(book.opener, feedback[0][1], book.duplicate_aware))
+            if reply is not None:
+                return reply
+    from util import read_words
+    from infomax import fast_expectation
+    from agent import WordleAgent
+    from solvetree import feedback_codes
+    pool = read_words(args.answer_file)
+    check_feedback(feedback, len(pool[0]))
+    for guess, colors in feedback:
+        code = colors_code(guess, colors)
+        pool = [word for word, word_code in zip(pool, feedback_codes(guess, pool)) if word_code == code]
+    if len(pool) == 0:
+        raise ValueError("No possible answer is consistent with the feedback")
+    agent = WordleAgent(fast_expectation, track_progress=False)
+    if len(feedback) == 0:
+        return agent.first_guess()
+    return agent.make_guess(read_words(args.allowed_file), pool)
+
+
+def solve_tree(args):
+    from util import read_words
+    from infomax import fast_expectation
+    from agent import WordleAgent
+    from solvetree import compile_tree, save_tree
+    agent = WordleAgent(fast_expectation, track_progress=False)
+    tree = compile_tree(agent, read_words(args.allowed_file), read_words(args.answer_file))
+    save_tree(tree, args.tree_file)
+    print(f"Saved the solve tree to {args.tree_file}.")
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(prog="wordle", description="Wordle AI tools.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    guess_parser = commands.add_parser("best-guess", help="the agent's next guess")
+    guess_parser.add_argument("allowed_file")
+    guess_parser.add_argument("answer_file")
+    guess_parser.add_argument("--feedback", nargs=2, action="append", metavar=("GUESS", "COLORS"),
+                              help="a guess and its colors (g green, y yellow, . gray), "
+                                   "once per guess made so far")
+    guess_parser.add_argument("--book", help="opening book built by openingbook.py")
+    tree_parser = commands.add_parser("solve-tree", help="precompile the agent's solve tree")
+    tree_parser.add_argument("allowed_file")
+    tree_parser.add_argument("answer_file")
+    tree_parser.add_argument("tree_file")
+    commands.add_parser("simulate", help="play every answer headlessly (see simulate.py -h)",
+                        add_help=False)
+    commands.add_parser("benchmark", help="time the hot paths (see benchmark.py -h)",
+                        add_help=False)
+    args, rest = parser.parse_known_args(args)
+    if args.command == "simulate":
+        from simulate import main as simulate_main
+        return simulate_main(rest)
+    if args.command == "benchmark":
+        from benchmark import main as benchmark_main
+        return benchmark_main(rest)
+    if len(rest) > 0:
+        parser.error(f"unrecognized arguments: {' '.join(rest)}")
+    if args.command == "best-guess":
+        try:
+            guess = best_guess(args)
+        except ValueError as error:
+            guess_parser.error(str(error))
+        print(guess)
+    else:
+        solve_tree(args)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())